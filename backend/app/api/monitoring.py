@@ -3,32 +3,142 @@ Monitoring and Health Check Endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable, AsyncIterator
 from datetime import datetime, UTC
 import asyncio
 import psutil
 import os
-from app.database import get_database, mongodb_client
-from app.core.config import settings
-from app.core.security import get_current_user
-from app.models.user import User
+import time
+import orjson
+from app.database import get_database, db as mongodb
+from app.core.config import (
+    settings,
+    INTEGRATION_AWS_S3,
+    INTEGRATION_REDIS,
+    INTEGRATION_SENDGRID,
+)
+from app.core.security import require_admin
 import redis.asyncio as redis
+import stripe
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
+# Probe results are cached briefly so that Kubernetes probes and metrics
+# scrapers don't hit MongoDB, Redis and Stripe on every request
+READINESS_CACHE_TTL = 5.0
+METRICS_CACHE_TTL = 30.0
+
+# Failed probes are cached only briefly, so a transient error clears
+# quickly while callers during an outage still share one probe
+PROBE_ERROR_CACHE_TTL = 1.0
+
+# Upper bound on the MongoDB ping behind the cheap readiness probe
+MONGODB_PING_TIMEOUT = 0.5
+
+# Upper bound on how long a blocking Stripe call may hold up a probe
+STRIPE_PROBE_TIMEOUT = 2.0
+
+# Stripe credentials don't change for the lifetime of the process
+_STRIPE_KEY = settings.get_stripe_key()
+_STRIPE_MODE = "test" if "test" in settings.stripe_publishable_key else "live"
+stripe.api_key = _STRIPE_KEY
+
+# serverStatus trimmed to the sections the status report reads; the full
+# document (locks, wiredTiger, metrics, ...) runs to megabytes of BSON
+SERVER_STATUS_COMMAND = {
+    "serverStatus": 1,
+    "connections": 1,
+    "repl": 0,
+    "metrics": 0,
+    "locks": 0,
+    "wiredTiger": 0,
+    "tcmalloc": 0,
+    "transactions": 0
+}
+
+# The current process and its start time are fixed for the process lifetime
+_PROCESS = psutil.Process(os.getpid())
+_PROCESS_START = datetime.fromtimestamp(_PROCESS.create_time(), UTC)
+
+# cpu_percent() reports usage since the previous call and returns 0.0 the
+# first time, so seed the baseline now. Each scrape then reports the average
+# since the last scrape, which is only comparable across a steady interval.
+_PROCESS.cpu_percent(interval=None)
+
+# key -> (expiry on the monotonic clock, cached result)
+_probe_cache: Dict[str, Tuple[float, Any]] = {}
+_probe_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _probe_failed(value: Any) -> bool:
+    """Whether a probe result reports an error"""
+    if isinstance(value, tuple):
+        return not value[0]
+    if isinstance(value, dict):
+        return value.get("status") == "error" or "error" in value
+    return False
+
+
+async def _cached(key: str, ttl: float, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached result for key if younger than ttl seconds,
+    otherwise await coro_factory() and cache its result.
+    Failures are cached for at most PROBE_ERROR_CACHE_TTL seconds.
+    Concurrent callers for the same key share a single in-flight probe.
+    """
+    entry = _probe_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    
+    lock = _probe_locks.get(key)
+    if lock is None:
+        lock = _probe_locks[key] = asyncio.Lock()
+    async with lock:
+        entry = _probe_cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        value = await coro_factory()
+        if _probe_failed(value):
+            ttl = min(ttl, PROBE_ERROR_CACHE_TTL)
+        _probe_cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+
+_redis_client: Optional[redis.Redis] = None
+_redis_lock = asyncio.Lock()
+
+
+async def _run_blocking(func: Callable[[], Any], timeout: float) -> Any:
+    """Run a blocking call in the default executor, bounded by timeout"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(None, func), timeout=timeout)
+
+
 async def get_redis_client() -> Optional[redis.Redis]:
-    """Get Redis client"""
-    if settings.redis_url:
-        try:
-            return await redis.from_url(
-                settings.redis_url,
-                decode_responses=settings.redis_decode_responses
-            )
-        except Exception:
-            return None
-    return None
+    """
+    Get the shared Redis client
+    The client is created once and reuses connections from its own pool
+    """
+    global _redis_client
+    if not settings.integrations & INTEGRATION_REDIS:
+        return None
+    
+    if _redis_client is None:
+        async with _redis_lock:
+            if _redis_client is None:
+                try:
+                    _redis_client = redis.from_url(
+                        settings.redis_url,
+                        decode_responses=settings.redis_decode_responses,
+                        max_connections=settings.redis_max_connections,
+                        health_check_interval=30
+                    )
+                except Exception:
+                    return None
+    return _redis_client
 
 
 @router.get("/health", status_code=status.HTTP_200_OK)
@@ -46,107 +156,147 @@ async def health_check() -> Dict[str, Any]:
     }
 
 
-@router.get("/readiness", status_code=status.HTTP_200_OK)
-async def readiness_check() -> Dict[str, Any]:
-    """
-    Readiness check for Kubernetes
-    Checks if all dependencies are available
-    """
-    checks = {
-        "mongodb": False,
-        "redis": False,
-        "stripe": False
-    }
-    details = {}
-    
-    # Check MongoDB
+async def _probe_mongodb() -> Tuple[bool, str]:
+    """Check MongoDB connectivity"""
+    if mongodb.client is None:
+        return False, "Not connected"
     try:
         db = await get_database()
-        await db.command("ping")
-        checks["mongodb"] = True
-        details["mongodb"] = "Connected"
+        await asyncio.wait_for(db.command("ping"), timeout=MONGODB_PING_TIMEOUT)
+        return True, "Connected"
+    except asyncio.TimeoutError:
+        return False, f"Error: ping timed out after {MONGODB_PING_TIMEOUT}s"
     except Exception as e:
-        details["mongodb"] = f"Error: {str(e)}"
-    
-    # Check Redis
+        return False, f"Error: {str(e)}"
+
+
+async def _probe_redis() -> Tuple[bool, str]:
+    """Check Redis connectivity"""
     try:
         redis_client = await get_redis_client()
         if redis_client:
             await redis_client.ping()
-            checks["redis"] = True
-            details["redis"] = "Connected"
-        else:
-            details["redis"] = "Not configured"
+            return True, "Connected"
+        return False, "Not configured"
     except Exception as e:
-        details["redis"] = f"Error: {str(e)}"
-    
-    # Check Stripe
+        return False, f"Error: {str(e)}"
+
+
+async def _probe_stripe() -> Tuple[bool, str]:
+    """Check Stripe connectivity"""
     try:
-        import stripe
-        stripe.api_key = settings.get_stripe_key()
         # Simple API call to check connectivity
-        stripe.Balance.retrieve()
-        checks["stripe"] = True
-        details["stripe"] = "Connected"
+        await _run_blocking(stripe.Balance.retrieve, STRIPE_PROBE_TIMEOUT)
+        return True, "Connected"
+    except asyncio.TimeoutError:
+        return False, f"Error: timed out after {STRIPE_PROBE_TIMEOUT}s"
     except Exception as e:
-        details["stripe"] = f"Error: {str(e)}"
-    
-    # Determine overall status
+        return False, f"Error: {str(e)}"
+
+
+def _readiness_response(checks: Dict[str, bool], details: Dict[str, str]) -> ORJSONResponse:
+    """Build a readiness response, 503 unless every check passed"""
     all_healthy = all(checks.values())
     status_code = status.HTTP_200_OK if all_healthy else status.HTTP_503_SERVICE_UNAVAILABLE
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "ready": all_healthy,
             "checks": checks,
             "details": details,
-            "timestamp": datetime.now(UTC).isoformat()
+            "timestamp": datetime.now(UTC)
         }
     )
 
 
-@router.get("/metrics", status_code=status.HTTP_200_OK)
-async def get_metrics(
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+@router.get("/readiness", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
+async def readiness_check() -> ORJSONResponse:
     """
-    Get application metrics
-    Requires admin authentication
+    Readiness check for Kubernetes
+    Only checks the MongoDB connection so frequent probes stay cheap;
+    see /readiness/full for the external dependencies
     """
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    checks = {}
+    details = {}
     
-    # System metrics
-    process = psutil.Process(os.getpid())
-    system_metrics = {
-        "cpu_percent": process.cpu_percent(),
-        "memory_mb": process.memory_info().rss / 1024 / 1024,
-        "memory_percent": process.memory_percent(),
-        "num_threads": process.num_threads(),
-        "uptime_seconds": (datetime.now(UTC) - datetime.fromtimestamp(process.create_time(), UTC)).total_seconds()
-    }
+    checks["mongodb"], details["mongodb"] = await _cached(
+        "readiness:mongodb", READINESS_CACHE_TTL, _probe_mongodb
+    )
     
-    # Database metrics
+    return _readiness_response(checks, details)
+
+
+@router.get("/readiness/full", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
+async def full_readiness_check() -> ORJSONResponse:
+    """
+    Full readiness check
+    Checks if all dependencies are available, including Redis and Stripe
+    """
+    checks = {}
+    details = {}
+    
+    checks["mongodb"], details["mongodb"] = await _cached(
+        "readiness:mongodb", READINESS_CACHE_TTL, _probe_mongodb
+    )
+    checks["redis"], details["redis"] = await _cached(
+        "readiness:redis", READINESS_CACHE_TTL, _probe_redis
+    )
+    checks["stripe"], details["stripe"] = await _cached(
+        "readiness:stripe", READINESS_CACHE_TTL, _probe_stripe
+    )
+    
+    return _readiness_response(checks, details)
+
+
+async def _collect_db_metrics() -> Dict[str, Any]:
+    """Collect collection counts and database size statistics"""
     db_metrics = {}
     try:
         db = await get_database()
         
-        # Get collection stats
+        # Collection counts come from collection metadata rather than a
+        # full scan, and run concurrently with the database stats
         collections = ["products", "users", "orders", "carts", "reviews"]
-        for collection in collections:
-            count = await db[collection].count_documents({})
-            db_metrics[f"{collection}_count"] = count
+        stats, *counts = await asyncio.gather(
+            db.command("dbStats"),
+            *(db[collection].estimated_document_count() for collection in collections)
+        )
+        db_metrics.update({
+            f"{collection}_count": count
+            for collection, count in zip(collections, counts)
+        })
         
         # Get database stats
-        stats = await db.command("dbStats")
         db_metrics["database_size_mb"] = stats.get("dataSize", 0) / 1024 / 1024
         db_metrics["index_size_mb"] = stats.get("indexSize", 0) / 1024 / 1024
     except Exception as e:
         db_metrics["error"] = str(e)
+    return db_metrics
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
+async def get_metrics(
+    current_user: Dict[str, Any] = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Get application metrics
+    Requires admin authentication
+    """
+    now = datetime.now(UTC)
+    
+    # System metrics, read in a single psutil snapshot
+    snapshot = _PROCESS.as_dict(attrs=["cpu_percent", "memory_info", "memory_percent", "num_threads"])
+    system_metrics = {
+        "cpu_percent": snapshot["cpu_percent"],
+        "memory_mb": snapshot["memory_info"].rss / 1024 / 1024,
+        "memory_percent": snapshot["memory_percent"],
+        "num_threads": snapshot["num_threads"],
+        "uptime_seconds": (now - _PROCESS_START).total_seconds()
+    }
+    
+    # Database metrics
+    db_metrics = await _cached("metrics:database", METRICS_CACHE_TTL, _collect_db_metrics)
     
     # Redis metrics
     redis_metrics = {}
@@ -171,40 +321,21 @@ async def get_metrics(
         "features": settings.get_feature_flags()
     }
     
-    return {
-        "timestamp": datetime.now(UTC).isoformat(),
+    return ORJSONResponse({
+        "timestamp": now,
         "system": system_metrics,
         "database": db_metrics,
         "redis": redis_metrics,
         "application": app_metrics
-    }
+    })
 
 
-@router.get("/status", status_code=status.HTTP_200_OK)
-async def detailed_status(
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
-    """
-    Get detailed system status
-    Requires admin authentication
-    """
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
-    status_report = {
-        "timestamp": datetime.now(UTC).isoformat(),
-        "environment": settings.app_env,
-        "services": {}
-    }
-    
-    # MongoDB Status
+async def _mongodb_status() -> Dict[str, Any]:
+    """MongoDB service status"""
     try:
         db = await get_database()
-        server_info = await db.command("serverStatus")
-        status_report["services"]["mongodb"] = {
+        server_info = await db.command(SERVER_STATUS_COMMAND)
+        return {
             "status": "operational",
             "version": server_info.get("version"),
             "uptime": server_info.get("uptime"),
@@ -214,112 +345,155 @@ async def detailed_status(
             }
         }
     except Exception as e:
-        status_report["services"]["mongodb"] = {
+        return {
             "status": "error",
             "message": str(e)
         }
-    
-    # Redis Status
+
+
+async def _redis_status() -> Dict[str, Any]:
+    """Redis service status"""
     try:
         redis_client = await get_redis_client()
         if redis_client:
             info = await redis_client.info("server")
-            status_report["services"]["redis"] = {
+            return {
                 "status": "operational",
                 "version": info.get("redis_version"),
                 "uptime": info.get("uptime_in_seconds")
             }
-        else:
-            status_report["services"]["redis"] = {
-                "status": "not_configured"
-            }
+        return {
+            "status": "not_configured"
+        }
     except Exception as e:
-        status_report["services"]["redis"] = {
+        return {
             "status": "error",
             "message": str(e)
         }
-    
-    # Stripe Status
+
+
+async def _stripe_status() -> Dict[str, Any]:
+    """Stripe service status"""
     try:
-        import stripe
-        stripe.api_key = settings.get_stripe_key()
-        balance = stripe.Balance.retrieve()
-        status_report["services"]["stripe"] = {
+        balance = await _run_blocking(stripe.Balance.retrieve, STRIPE_PROBE_TIMEOUT)
+        return {
             "status": "operational",
-            "mode": "test" if "test" in settings.stripe_publishable_key else "live",
+            "mode": _STRIPE_MODE,
             "currency": balance.get("available", [{}])[0].get("currency", "usd") if balance.get("available") else "usd"
         }
+    except asyncio.TimeoutError:
+        return {
+            "status": "error",
+            "message": f"Timed out after {STRIPE_PROBE_TIMEOUT}s"
+        }
     except Exception as e:
-        status_report["services"]["stripe"] = {
+        return {
             "status": "error",
             "message": str(e)
         }
-    
-    # Email Service Status (SendGrid)
-    if settings.sendgrid_api_key:
-        try:
-            # Basic check - would need actual SendGrid API call in production
-            status_report["services"]["email"] = {
-                "status": "configured",
-                "provider": "SendGrid"
-            }
-        except Exception as e:
-            status_report["services"]["email"] = {
-                "status": "error",
-                "message": str(e)
-            }
-    else:
-        status_report["services"]["email"] = {
-            "status": "not_configured"
+
+
+async def _email_status() -> Dict[str, Any]:
+    """Email service status (SendGrid)"""
+    if settings.integrations & INTEGRATION_SENDGRID:
+        # Basic check - would need actual SendGrid API call in production
+        return {
+            "status": "configured",
+            "provider": "SendGrid"
         }
-    
-    # Storage Status (AWS S3)
-    if settings.aws_access_key_id:
-        try:
-            status_report["services"]["storage"] = {
-                "status": "configured",
-                "provider": "AWS S3",
-                "bucket": settings.aws_s3_bucket_name,
-                "region": settings.aws_s3_region
-            }
-        except Exception as e:
-            status_report["services"]["storage"] = {
-                "status": "error",
-                "message": str(e)
-            }
-    else:
-        status_report["services"]["storage"] = {
-            "status": "not_configured"
+    return {
+        "status": "not_configured"
+    }
+
+
+async def _storage_status() -> Dict[str, Any]:
+    """Storage service status (AWS S3)"""
+    if settings.integrations & INTEGRATION_AWS_S3:
+        return {
+            "status": "configured",
+            "provider": "AWS S3",
+            "bucket": settings.aws_s3_bucket_name,
+            "region": settings.aws_s3_region
+        }
+    return {
+        "status": "not_configured"
+    }
+
+
+async def _named_check(name: str, check: Awaitable[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Await a service check, mapping a failure to an error entry"""
+    try:
+        return name, await check
+    except Exception as e:
+        return name, {
+            "status": "error",
+            "message": str(e)
         }
+
+
+async def _stream_status_report() -> AsyncIterator[bytes]:
+    """
+    Stream the status report as JSON
+    Each service entry is written as soon as its check completes, so the
+    response starts with the fastest service instead of waiting on all of them
+    """
+    yield b'{"timestamp":' + orjson.dumps(datetime.now(UTC))
+    yield b',"environment":' + orjson.dumps(settings.app_env)
+    yield b',"services":{'
+    
+    # Service checks are independent, so run them concurrently; the
+    # report then takes as long as the slowest check rather than the sum
+    tasks = [
+        asyncio.ensure_future(_named_check(name, check))
+        for name, check in (
+            ("mongodb", _cached("status:mongodb", METRICS_CACHE_TTL, _mongodb_status)),
+            ("redis", _cached("status:redis", METRICS_CACHE_TTL, _redis_status)),
+            ("stripe", _cached("status:stripe", METRICS_CACHE_TTL, _stripe_status)),
+            ("email", _email_status()),
+            ("storage", _storage_status())
+        )
+    ]
+    operational_services = 0
+    try:
+        for index, next_result in enumerate(asyncio.as_completed(tasks)):
+            name, result = await next_result
+            if result["status"] == "operational":
+                operational_services += 1
+            separator = b"," if index else b""
+            yield separator + orjson.dumps(name) + b":" + orjson.dumps(result)
+    finally:
+        # Don't leave checks running if the client goes away mid-stream
+        for task in tasks:
+            task.cancel()
     
     # Calculate overall health score
-    operational_services = sum(
-        1 for service in status_report["services"].values()
-        if service.get("status") == "operational"
-    )
-    total_services = len(status_report["services"])
+    total_services = len(tasks)
     health_score = (operational_services / total_services) * 100 if total_services > 0 else 0
+    overall_status = "healthy" if health_score >= 80 else "degraded" if health_score >= 50 else "unhealthy"
     
-    status_report["health_score"] = round(health_score, 2)
-    status_report["overall_status"] = "healthy" if health_score >= 80 else "degraded" if health_score >= 50 else "unhealthy"
-    
-    return status_report
+    yield b'},"health_score":' + orjson.dumps(round(health_score, 2))
+    yield b',"overall_status":' + orjson.dumps(overall_status) + b"}"
+
+
+@router.get("/status", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def detailed_status(
+    current_user: Dict[str, Any] = Depends(require_admin)
+) -> StreamingResponse:
+    """
+    Get detailed system status
+    Requires admin authentication
+    """
+    return StreamingResponse(_stream_status_report(), media_type="application/json")
 
 
 @router.post("/test-error", status_code=status.HTTP_200_OK)
 async def test_error_handling(
-    current_user: User = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(require_admin)
 ) -> Dict[str, str]:
     """
     Test error handling and logging
     Requires admin authentication
     """
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
     # This would trigger error logging
     raise HTTPException(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -3,13 +3,111 @@ Enhanced Configuration Management for NitePutter Pro
 Validates and manages all environment variables with type safety
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator, SecretStr, HttpUrl
-from functools import lru_cache
-import os
+from typing import Annotated, List, Literal, Optional, Dict, Any, Tuple
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from pydantic import AliasChoices, BeforeValidator, Field, PrivateAttr, SecretStr, HttpUrl
+from dataclasses import dataclass
+from functools import lru_cache, cached_property
 from pathlib import Path
 
+import orjson
+
+def _upper(value: Any) -> Any:
+    return value.upper() if isinstance(value, str) else value
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+# Feature flag bits for Settings.has_feature()
+FEATURE_REVIEWS = 1 << 0
+FEATURE_WISHLIST = 1 << 1
+FEATURE_COUPONS = 1 << 2
+FEATURE_NEWSLETTER = 1 << 3
+FEATURE_SOCIAL_LOGIN = 1 << 4
+FEATURE_GUEST_CHECKOUT = 1 << 5
+
+# Integration bits for Settings.has_integration()
+INTEGRATION_REDIS = 1 << 0
+INTEGRATION_SENTRY = 1 << 1
+INTEGRATION_SENDGRID = 1 << 2
+INTEGRATION_SMTP = 1 << 3
+INTEGRATION_AWS_S3 = 1 << 4
+INTEGRATION_CLOUDINARY = 1 << 5
+INTEGRATION_GOOGLE_OAUTH = 1 << 6
+INTEGRATION_FACEBOOK_OAUTH = 1 << 7
+INTEGRATION_TAX_API = 1 << 8
+INTEGRATION_USPS = 1 << 9
+INTEGRATION_UPS = 1 << 10
+INTEGRATION_FEDEX = 1 << 11
+INTEGRATION_GOOGLE_ANALYTICS = 1 << 12
+INTEGRATION_MIXPANEL = 1 << 13
+
+
+def _secret_value(secret: Optional[SecretStr]) -> Optional[str]:
+    return secret.get_secret_value() if secret else None
+
+
+def _split_csv(value: Any) -> Any:
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            return orjson.loads(value)
+        return [item.strip() for item in value.split(",")]
+    return value
+
+
+# Accepts either a JSON array (ALLOWED_ORIGINS='["https://a.com","https://b.com"]')
+# or a comma-separated string (ALLOWED_ORIGINS=https://a.com,https://b.com)
+CommaSeparatedList = Annotated[List[str], NoDecode, BeforeValidator(_split_csv)]
+LogLevel = Annotated[Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], BeforeValidator(_upper)]
+def _app_env(value: Any) -> Any:
+    value = _lower(value)
+    # Legacy ENVIRONMENT value
+    return "testing" if value == "test" else value
+
+
+AppEnv = Annotated[Literal["development", "staging", "production", "testing"], BeforeValidator(_app_env)]
+SameSite = Annotated[Literal["strict", "lax", "none"], BeforeValidator(_lower)]
+
+
+def _env(*names: str) -> AliasChoices:
+    """Accept the field name plus legacy environment variable names, first match wins"""
+    return AliasChoices(*names)
+
+
+@dataclass(frozen=True, slots=True)
+class StripeConfig:
+    """Stripe configuration"""
+    secret_key: str
+    publishable_key: str
+    webhook_secret: Optional[str]
+    success_url: str
+    cancel_url: str
+
+
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    """Email configuration"""
+    host: str
+    port: int
+    username: Optional[str]
+    password: Optional[str]
+    use_tls: bool
+    from_email: str
+    from_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class JWTConfig:
+    """JWT configuration"""
+    secret_key: str
+    refresh_secret_key: str
+    algorithm: str
+    access_token_expire_minutes: int
+    refresh_token_expire_days: int
+
+
 class Settings(BaseSettings):
     """
     Application settings with validation and type safety
@@ -17,22 +115,32 @@ class Settings(BaseSettings):
     
     # Application Settings
     app_name: str = Field(default="NitePutter Pro", description="Application name")
-    app_env: str = Field(default="development", description="Environment: development, staging, production")
-    app_debug: bool = Field(default=False, description="Debug mode")
-    app_url: str = Field(default="http://localhost:8000", description="Backend API URL")
+    app_version: str = Field(default="1.0.0", description="Application version")
+    app_env: AppEnv = Field(default="development", validation_alias=_env("app_env", "environment"), description="Environment: development, staging, production")
+    app_debug: bool = Field(default=False, validation_alias=_env("app_debug", "debug"), description="Debug mode")
+    app_url: str = Field(default="http://localhost:8000", validation_alias=_env("app_url", "backend_url"), description="Backend API URL")
     frontend_url: str = Field(default="http://localhost:5173", description="Frontend URL")
-    allowed_origins: List[str] = Field(default=["http://localhost:5173"], description="CORS allowed origins")
-    
-    # Security
-    secret_key: SecretStr = Field(..., description="Secret key for JWT encoding")
-    algorithm: str = Field(default="HS256", description="JWT algorithm")
+    allowed_origins: CommaSeparatedList = Field(default=["http://localhost:5173"], description="CORS allowed origins")
+    
+    # Server
+    host: str = Field(default="0.0.0.0", description="Server bind host")
+    port: int = Field(default=8000, description="Server port")
+    workers: int = Field(default=4, description="Number of server workers")
+    
+    # Security - JWT_* names win when both are set, so tokens signed with
+    # JWT_SECRET_KEY keep verifying
+    secret_key: SecretStr = Field(..., validation_alias=_env("jwt_secret_key", "secret_key"), description="Secret key for JWT encoding")
+    refresh_secret_key: Optional[SecretStr] = Field(default=None, validation_alias=_env("jwt_refresh_secret_key", "refresh_secret_key"), description="Secret key for refresh tokens (defaults to secret_key)")
+    algorithm: str = Field(default="HS256", validation_alias=_env("algorithm", "jwt_algorithm"), description="JWT algorithm")
     access_token_expire_minutes: int = Field(default=30, description="Access token expiration in minutes")
     refresh_token_expire_days: int = Field(default=7, description="Refresh token expiration in days")
     password_reset_token_expire_hours: int = Field(default=24, description="Password reset token expiration")
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, description="Bcrypt cost factor")
+    password_min_length: int = Field(default=8, ge=1, description="Minimum password length")
     
     # MongoDB Configuration
     mongodb_url: str = Field(..., description="MongoDB connection URL")
-    mongodb_db_name: str = Field(default="niteputter_pro", description="MongoDB database name")
+    mongodb_db_name: str = Field(default="niteputter_pro", validation_alias=_env("mongodb_db_name", "database_name"), description="MongoDB database name")
     mongodb_max_pool_size: int = Field(default=100, description="MongoDB connection pool max size")
     mongodb_min_pool_size: int = Field(default=10, description="MongoDB connection pool min size")
     
@@ -47,24 +155,39 @@ class Settings(BaseSettings):
     stripe_publishable_key: str = Field(..., description="Stripe publishable key")
     stripe_webhook_secret: Optional[SecretStr] = Field(default=None, description="Stripe webhook secret")
     stripe_api_version: str = Field(default="2023-10-16", description="Stripe API version")
+    stripe_success_url: str = Field(default="http://localhost:3000/checkout/success", description="Checkout success redirect URL")
+    stripe_cancel_url: str = Field(default="http://localhost:3000/checkout/cancel", description="Checkout cancel redirect URL")
     
     # Email Configuration (SendGrid)
     sendgrid_api_key: Optional[SecretStr] = Field(default=None, description="SendGrid API key")
-    from_email: str = Field(default="orders@niteputter.com", description="From email address")
+    from_email: str = Field(default="orders@niteputter.com", validation_alias=_env("from_email", "email_from"), description="From email address")
+    from_name: str = Field(default="NitePutter Pro", validation_alias=_env("from_name", "email_from_name"), description="From display name")
     support_email: str = Field(default="support@niteputter.com", description="Support email address")
     admin_email: str = Field(default="admin@niteputter.com", description="Admin email address")
     email_templates_dir: Path = Field(default=Path("./email_templates"), description="Email templates directory")
     
+    # Email Configuration (SMTP)
+    smtp_host: str = Field(default="smtp.gmail.com", description="SMTP host")
+    smtp_port: int = Field(default=587, description="SMTP port")
+    smtp_username: Optional[str] = Field(default=None, description="SMTP username")
+    smtp_password: Optional[SecretStr] = Field(default=None, description="SMTP password")
+    smtp_use_tls: bool = Field(default=True, description="Use TLS for SMTP")
+    
     # AWS S3 Configuration
     aws_access_key_id: Optional[str] = Field(default=None, description="AWS access key ID")
     aws_secret_access_key: Optional[SecretStr] = Field(default=None, description="AWS secret access key")
-    aws_s3_bucket_name: str = Field(default="niteputter-products", description="S3 bucket name")
-    aws_s3_region: str = Field(default="us-east-1", description="AWS region")
+    aws_s3_bucket_name: str = Field(default="niteputter-products", validation_alias=_env("aws_s3_bucket_name", "s3_bucket_name"), description="S3 bucket name")
+    aws_s3_region: str = Field(default="us-east-1", validation_alias=_env("aws_s3_region", "aws_region"), description="AWS region")
     aws_s3_cdn_url: Optional[str] = Field(default=None, description="CDN URL for S3")
     aws_s3_max_file_size: int = Field(default=10485760, description="Max file size in bytes (10MB)")
     
+    # Cloudinary (image storage)
+    cloudinary_cloud_name: Optional[str] = Field(default=None, description="Cloudinary cloud name")
+    cloudinary_api_key: Optional[str] = Field(default=None, description="Cloudinary API key")
+    cloudinary_api_secret: Optional[SecretStr] = Field(default=None, description="Cloudinary API secret")
+    
     # Logging Configuration
-    log_level: str = Field(default="INFO", description="Logging level")
+    log_level: LogLevel = Field(default="INFO", description="Logging level")
     log_file: Optional[Path] = Field(default=None, description="Log file path")
     log_max_bytes: int = Field(default=10485760, description="Max log file size in bytes")
     log_backup_count: int = Field(default=5, description="Number of log backups to keep")
@@ -74,22 +197,24 @@ class Settings(BaseSettings):
     rate_limit_default: str = Field(default="100/minute", description="Default rate limit")
     rate_limit_auth: str = Field(default="5/minute", description="Auth rate limit")
     rate_limit_checkout: str = Field(default="10/minute", description="Checkout rate limit")
+    rate_limit_requests: int = Field(default=100, description="Requests allowed per rate limit period")
+    rate_limit_period: int = Field(default=60, description="Rate limit period in seconds")
     
     # Session Configuration
     session_secret_key: Optional[SecretStr] = Field(default=None, description="Session secret key")
     session_cookie_name: str = Field(default="niteputter_session", description="Session cookie name")
     session_cookie_secure: bool = Field(default=False, description="Secure session cookies")
     session_cookie_httponly: bool = Field(default=True, description="HTTP only session cookies")
-    session_cookie_samesite: str = Field(default="lax", description="SameSite cookie attribute")
+    session_cookie_samesite: SameSite = Field(default="lax", description="SameSite cookie attribute")
     session_expire_hours: int = Field(default=24, description="Session expiration in hours")
     
     # CORS Configuration
     cors_allow_credentials: bool = Field(default=True, description="Allow credentials in CORS")
-    cors_allow_methods: List[str] = Field(
+    cors_allow_methods: CommaSeparatedList = Field(
         default=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         description="Allowed CORS methods"
     )
-    cors_allow_headers: List[str] = Field(
+    cors_allow_headers: CommaSeparatedList = Field(
         default=["Content-Type", "Authorization"],
         description="Allowed CORS headers"
     )
@@ -99,12 +224,19 @@ class Settings(BaseSettings):
     google_analytics_id: Optional[str] = Field(default=None, description="Google Analytics ID")
     mixpanel_token: Optional[str] = Field(default=None, description="Mixpanel token")
     
+    # Social OAuth
+    google_client_id: Optional[str] = Field(default=None, description="Google OAuth client ID")
+    google_client_secret: Optional[SecretStr] = Field(default=None, description="Google OAuth client secret")
+    facebook_client_id: Optional[str] = Field(default=None, description="Facebook OAuth client ID")
+    facebook_client_secret: Optional[SecretStr] = Field(default=None, description="Facebook OAuth client secret")
+    
     # Feature Flags
-    feature_reviews: bool = Field(default=True, description="Enable product reviews")
-    feature_wishlist: bool = Field(default=True, description="Enable wishlist feature")
-    feature_coupons: bool = Field(default=True, description="Enable coupons")
+    feature_reviews: bool = Field(default=True, validation_alias=_env("feature_reviews", "enable_reviews"), description="Enable product reviews")
+    feature_wishlist: bool = Field(default=True, validation_alias=_env("feature_wishlist", "enable_wishlist"), description="Enable wishlist feature")
+    feature_coupons: bool = Field(default=True, validation_alias=_env("feature_coupons", "enable_coupons"), description="Enable coupons")
     feature_newsletter: bool = Field(default=True, description="Enable newsletter")
     feature_social_login: bool = Field(default=False, description="Enable social login")
+    feature_guest_checkout: bool = Field(default=True, validation_alias=_env("feature_guest_checkout", "enable_guest_checkout"), description="Enable guest checkout")
     
     # Pagination
     default_page_size: int = Field(default=20, description="Default page size")
@@ -125,6 +257,28 @@ class Settings(BaseSettings):
     tax_api_key: Optional[str] = Field(default=None, description="Tax API key")
     tax_api_url: Optional[str] = Field(default=None, description="Tax API URL")
     
+    # Shipping
+    usps_api_key: Optional[str] = Field(default=None, description="USPS API key")
+    ups_api_key: Optional[str] = Field(default=None, description="UPS API key")
+    fedex_api_key: Optional[str] = Field(default=None, description="FedEx API key")
+    default_shipping_rate: float = Field(default=9.99, description="Default flat shipping rate")
+    free_shipping_threshold: float = Field(default=100.00, description="Order subtotal for free shipping")
+    
+    # Inventory
+    low_stock_threshold: int = Field(default=10, description="Low stock alert threshold")
+    reserve_stock_minutes: int = Field(default=15, description="Minutes to hold stock during checkout")
+    
+    # Cart
+    cart_expiry_days: int = Field(default=30, description="Days before an idle cart expires")
+    abandoned_cart_hours: int = Field(default=1, description="Hours before a cart counts as abandoned")
+    
+    # Orders
+    order_number_prefix: str = Field(default="NPP", description="Order number prefix")
+    
+    # Tax
+    enable_tax_calculation: bool = Field(default=True, description="Enable tax calculation")
+    default_tax_rate: float = Field(default=0.0875, description="Default tax rate (8.75%)")
+    
     # Testing
     test_database_name: str = Field(default="niteputter_test", description="Test database name")
     test_redis_db: int = Field(default=15, description="Test Redis database")
@@ -133,104 +287,179 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="allow"  # Allow extra fields for flexibility
+        extra="allow",  # Allow extra fields for flexibility
+        env_parse_none_str="null",
+        frozen=True  # Settings are read-only once loaded
     )
     
-    @field_validator("app_env")
-    def validate_app_env(cls, v: str) -> str:
-        """Validate application environment"""
-        allowed = ["development", "staging", "production", "testing"]
-        if v not in allowed:
-            raise ValueError(f"app_env must be one of {allowed}")
-        return v
-    
-    @field_validator("allowed_origins", mode="before")
-    def parse_allowed_origins(cls, v: Any) -> List[str]:
-        """Parse comma-separated allowed origins"""
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
-        return v
-    
-    @field_validator("cors_allow_methods", mode="before")
-    def parse_cors_methods(cls, v: Any) -> List[str]:
-        """Parse comma-separated CORS methods"""
-        if isinstance(v, str):
-            return [method.strip() for method in v.split(",")]
-        return v
-    
-    @field_validator("cors_allow_headers", mode="before")
-    def parse_cors_headers(cls, v: Any) -> List[str]:
-        """Parse comma-separated CORS headers"""
-        if isinstance(v, str):
-            return [header.strip() for header in v.split(",")]
-        return v
-    
-    @field_validator("log_level")
-    def validate_log_level(cls, v: str) -> str:
-        """Validate log level"""
-        allowed = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        v = v.upper()
-        if v not in allowed:
-            raise ValueError(f"log_level must be one of {allowed}")
-        return v
-    
-    @field_validator("session_cookie_samesite")
-    def validate_samesite(cls, v: str) -> str:
-        """Validate SameSite attribute"""
-        allowed = ["strict", "lax", "none"]
-        v = v.lower()
-        if v not in allowed:
-            raise ValueError(f"session_cookie_samesite must be one of {allowed}")
-        return v
+    # Environment checks, resolved once after validation
+    _is_production: bool = PrivateAttr(default=False)
+    _is_development: bool = PrivateAttr(default=False)
+    _is_testing: bool = PrivateAttr(default=False)
+    
+    # Connection targets, resolved once for the current environment
+    _database_url: str = PrivateAttr(default="")
+    _redis_database: int = PrivateAttr(default=0)
+    
+    # Plain secret values, unwrapped once for the external API clients
+    _stripe_key: str = PrivateAttr(default="")
+    _stripe_webhook_secret: Optional[str] = PrivateAttr(default=None)
+    _sendgrid_key: Optional[str] = PrivateAttr(default=None)
+    _aws_secret: Optional[str] = PrivateAttr(default=None)
+    _session_secret: Optional[str] = PrivateAttr(default=None)
+    
+    # Enabled features as a FEATURE_* bitmask
+    _feature_mask: int = PrivateAttr(default=0)
+    
+    # Configured integrations as INTEGRATION_* bits
+    _integrations: int = PrivateAttr(default=0)
+    
+    # Production configuration problems, checked once since settings are frozen
+    _production_errors: Tuple[str, ...] = PrivateAttr(default=())
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._is_production = self.app_env == "production"
+        self._is_development = self.app_env == "development"
+        self._is_testing = self.app_env == "testing"
+        
+        if self._is_testing:
+            # Use test database for testing
+            self._database_url = self.mongodb_url.replace(
+                self.mongodb_db_name,
+                self.test_database_name
+            )
+            self._redis_database = self.test_redis_db
+        else:
+            self._database_url = self.mongodb_url
+            self._redis_database = self.redis_db
+        
+        self._stripe_key = self.stripe_secret_key.get_secret_value()
+        self._stripe_webhook_secret = _secret_value(self.stripe_webhook_secret)
+        self._sendgrid_key = _secret_value(self.sendgrid_api_key)
+        self._aws_secret = _secret_value(self.aws_secret_access_key)
+        self._session_secret = _secret_value(self.session_secret_key)
+        
+        self._feature_mask = (
+            (FEATURE_REVIEWS if self.feature_reviews else 0)
+            | (FEATURE_WISHLIST if self.feature_wishlist else 0)
+            | (FEATURE_COUPONS if self.feature_coupons else 0)
+            | (FEATURE_NEWSLETTER if self.feature_newsletter else 0)
+            | (FEATURE_SOCIAL_LOGIN if self.feature_social_login else 0)
+            | (FEATURE_GUEST_CHECKOUT if self.feature_guest_checkout else 0)
+        )
+        
+        self._integrations = (
+            (INTEGRATION_REDIS if self.redis_url else 0)
+            | (INTEGRATION_SENTRY if self.sentry_dsn else 0)
+            | (INTEGRATION_SENDGRID if self.sendgrid_api_key else 0)
+            | (INTEGRATION_SMTP if self.smtp_username else 0)
+            | (INTEGRATION_AWS_S3 if self.aws_access_key_id else 0)
+            | (INTEGRATION_CLOUDINARY if self.cloudinary_cloud_name else 0)
+            | (INTEGRATION_GOOGLE_OAUTH if self.google_client_id else 0)
+            | (INTEGRATION_FACEBOOK_OAUTH if self.facebook_client_id else 0)
+            | (INTEGRATION_TAX_API if self.tax_api_key else 0)
+            | (INTEGRATION_USPS if self.usps_api_key else 0)
+            | (INTEGRATION_UPS if self.ups_api_key else 0)
+            | (INTEGRATION_FEDEX if self.fedex_api_key else 0)
+            | (INTEGRATION_GOOGLE_ANALYTICS if self.google_analytics_id else 0)
+            | (INTEGRATION_MIXPANEL if self.mixpanel_token else 0)
+        )
+        
+        self._production_errors = tuple(self._collect_production_errors())
     
     @property
     def is_production(self) -> bool:
         """Check if running in production"""
-        return self.app_env == "production"
+        return self._is_production
     
     @property
     def is_development(self) -> bool:
         """Check if running in development"""
-        return self.app_env == "development"
+        return self._is_development
     
     @property
     def is_testing(self) -> bool:
         """Check if running in testing"""
-        return self.app_env == "testing"
+        return self._is_testing
     
     @property
     def database_url(self) -> str:
         """Get the appropriate database URL"""
-        if self.is_testing:
-            # Use test database for testing
-            return self.mongodb_url.replace(
-                self.mongodb_db_name, 
-                self.test_database_name
-            )
-        return self.mongodb_url
+        return self._database_url
     
     @property
     def redis_database(self) -> int:
         """Get the appropriate Redis database"""
-        if self.is_testing:
-            return self.test_redis_db
-        return self.redis_db
+        return self._redis_database
     
     def get_stripe_key(self) -> str:
         """Get Stripe secret key value"""
-        return self.stripe_secret_key.get_secret_value()
+        return self._stripe_key
+    
+    def get_stripe_webhook_secret(self) -> Optional[str]:
+        """Get Stripe webhook secret value"""
+        return self._stripe_webhook_secret
     
     def get_sendgrid_key(self) -> Optional[str]:
         """Get SendGrid API key value"""
-        if self.sendgrid_api_key:
-            return self.sendgrid_api_key.get_secret_value()
-        return None
+        return self._sendgrid_key
     
     def get_aws_secret(self) -> Optional[str]:
         """Get AWS secret access key value"""
-        if self.aws_secret_access_key:
-            return self.aws_secret_access_key.get_secret_value()
-        return None
+        return self._aws_secret
+    
+    def get_session_secret(self) -> Optional[str]:
+        """Get session secret key value"""
+        return self._session_secret
+    
+    @cached_property
+    def stripe_config(self) -> StripeConfig:
+        """Get Stripe configuration"""
+        return StripeConfig(
+            secret_key=self._stripe_key,
+            publishable_key=self.stripe_publishable_key,
+            webhook_secret=self._stripe_webhook_secret,
+            success_url=self.stripe_success_url,
+            cancel_url=self.stripe_cancel_url
+        )
+    
+    @cached_property
+    def email_config(self) -> EmailConfig:
+        """Get email configuration"""
+        return EmailConfig(
+            host=self.smtp_host,
+            port=self.smtp_port,
+            username=self.smtp_username,
+            password=_secret_value(self.smtp_password),
+            use_tls=self.smtp_use_tls,
+            from_email=self.from_email,
+            from_name=self.from_name
+        )
+    
+    @cached_property
+    def jwt_config(self) -> JWTConfig:
+        """Get JWT configuration"""
+        secret_key = self.secret_key.get_secret_value()
+        return JWTConfig(
+            secret_key=secret_key,
+            refresh_secret_key=_secret_value(self.refresh_secret_key) or secret_key,
+            algorithm=self.algorithm,
+            access_token_expire_minutes=self.access_token_expire_minutes,
+            refresh_token_expire_days=self.refresh_token_expire_days
+        )
+    
+    def has_feature(self, flag: int) -> bool:
+        """Check whether a FEATURE_* flag is enabled"""
+        return bool(self._feature_mask & flag)
+    
+    @property
+    def integrations(self) -> int:
+        """Bitmask of configured INTEGRATION_* flags"""
+        return self._integrations
+    
+    def has_integration(self, flag: int) -> bool:
+        """Check whether an INTEGRATION_* flag is configured"""
+        return bool(self._integrations & flag)
     
     def get_feature_flags(self) -> Dict[str, bool]:
         """Get all feature flags"""
@@ -242,8 +471,8 @@ class Settings(BaseSettings):
             "social_login": self.feature_social_login
         }
     
-    def validate_production_config(self) -> List[str]:
-        """Validate configuration for production environment"""
+    def _collect_production_errors(self) -> List[str]:
+        """Check critical settings for the production environment"""
         errors = []
         
         if self.is_production:
@@ -270,6 +499,10 @@ class Settings(BaseSettings):
                 errors.append("Sentry DSN is recommended for production error tracking")
         
         return errors
+    
+    def validate_production_config(self) -> List[str]:
+        """Validate configuration for production environment"""
+        return list(self._production_errors)
 
 
 @lru_cache()
@@ -292,4 +525,16 @@ def get_settings() -> Settings:
 
 
 # Create global settings instance
-settings = get_settings()
\ No newline at end of file
+settings = get_settings()
+
+def override_settings(**overrides: Any) -> Settings:
+    """
+    Clone the loaded settings with some fields replaced
+    Intended for tests - overrides are not validated
+    """
+    overridden = get_settings().model_copy(update=overrides)
+    # Drop config bundles cached on the prototype and recompute derived state
+    for name in ("stripe_config", "email_config", "jwt_config"):
+        overridden.__dict__.pop(name, None)
+    overridden.model_post_init(None)
+    return overridden
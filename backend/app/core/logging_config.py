@@ -2,22 +2,44 @@
 Centralized Logging Configuration for NitePutter Pro
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-import json
-from datetime import datetime
+from typing import Any, Dict, MutableMapping, Optional, TextIO, Tuple
+import orjson
 from app.core.config import settings
 
+# Last formatted second, shared by records logged within the same second
+_last_second: Tuple[int, str] = (-1, "")
+
+
+def _fast_iso(record: logging.LogRecord) -> str:
+    """Format record.created as an ISO 8601 UTC timestamp"""
+    global _last_second
+    second = int(record.created)
+    cached_second, prefix = _last_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _last_second = (second, prefix)
+    return f"{prefix}.{int(record.msecs):03d}Z"
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
+        return self.format_bytes(record).decode()
+    
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as UTF-8 encoded JSON"""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _fast_iso(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -38,7 +60,116 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str)
+
+
+class OrjsonBytesHandler(logging.StreamHandler):
+    """Stream handler writing JSONFormatter bytes straight to the binary stream"""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = getattr(self.stream, "buffer", None)
+        if buffer is None or not isinstance(self.formatter, JSONFormatter):
+            super().emit(record)
+            return
+        try:
+            buffer.write(self.formatter.format_bytes(record) + b"\n")
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that batches writes
+    Flushes at most once per flush_interval (immediately for errors, and
+    whenever its queue listener goes idle) and tracks the file size in
+    bytes itself instead of seeking before every record
+    """
+    
+    flush_interval = 1.0
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._size = 0
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+    
+    def _open(self) -> TextIO:
+        stream = super()._open()
+        self._size = stream.seek(0, 2)
+        return stream
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or "utf-8"))
+            if self.maxBytes > 0 and self._size and self._size + size >= self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+            
+            now = time.monotonic()
+            if record.levelno >= logging.ERROR or now - self._last_flush >= self.flush_interval:
+                self.stream.flush()
+                self._last_flush = now
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for an in-process listener; records are formatted by the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue runs dry"""
+    
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        # Buffered records would otherwise sit unwritten while the app is idle
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+# Background listeners writing queued records, by name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _queue_handler(name: str, *handlers: logging.Handler) -> logging.Handler:
+    """
+    Move handlers behind a queue drained by a background thread
+    Replaces any listener previously started under the same name
+    """
+    previous = _listeners.pop(name, None)
+    if previous is not None:
+        previous.stop()
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    return _LocalQueueHandler(log_queue)
+
+
+def stop_logging() -> None:
+    """Drain and stop the background log listeners"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+
+# Runs before logging's own shutdown hook, which flushes and closes the handlers
+atexit.register(stop_logging)
 
 
 def setup_logging(
@@ -61,15 +192,18 @@ def setup_logging(
     if log_file is None and settings.log_file:
         log_file = settings.log_file
     
+    level = getattr(logging, log_level.upper())
+    
     # Get root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level))
+    root_logger.setLevel(level)
     
     # Clear existing handlers
     root_logger.handlers = []
     
     # Create formatters
-    if json_format and settings.is_production:
+    use_json = json_format and settings.is_production
+    if use_json:
         formatter = JSONFormatter()
     else:
         formatter = logging.Formatter(
@@ -78,8 +212,11 @@ def setup_logging(
         )
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level))
+    if use_json:
+        console_handler = OrjsonBytesHandler(sys.stdout)
+    else:
+        console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
     
@@ -89,15 +226,15 @@ def setup_logging(
         log_file = Path(log_file)
         log_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Rotating file handler
-        file_handler = logging.handlers.RotatingFileHandler(
+        # Rotating file handler, written from a background thread
+        file_handler = BufferedRotatingFileHandler(
             log_file,
             maxBytes=settings.log_max_bytes,
             backupCount=settings.log_backup_count
         )
-        file_handler.setLevel(getattr(logging, log_level))
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(_queue_handler("root", file_handler))
     
     # Configure third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -106,28 +243,30 @@ def setup_logging(
     
     # Log startup message
     root_logger.info(
-        f"Logging configured - Level: {log_level}, "
-        f"Environment: {settings.app_env}, "
-        f"File: {log_file or 'None'}"
+        "Logging configured - Level: %s, Environment: %s, File: %s",
+        log_level,
+        settings.app_env,
+        log_file or "None"
     )
 
 
+# Context keys copied onto every record by LoggerAdapter
+_CONTEXT_KEYS = ("request_id", "user_id", "ip_address")
+
+
 class LoggerAdapter(logging.LoggerAdapter):
     """Custom logger adapter to add context to logs"""
     
-    def process(self, msg, kwargs):
+    def __init__(self, logger: logging.Logger, extra: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(logger, extra)
+        # Request context is fixed for the adapter's lifetime
+        context = extra or {}
+        self._context_extra = {key: context[key] for key in _CONTEXT_KEYS if key in context}
+    
+    def process(self, msg: Any, kwargs: MutableMapping[str, Any]) -> Tuple[Any, MutableMapping[str, Any]]:
         """Add extra context to log records"""
-        extra = kwargs.get("extra", {})
-        
-        # Add request context if available
-        if hasattr(self, "request_id"):
-            extra["request_id"] = self.request_id
-        if hasattr(self, "user_id"):
-            extra["user_id"] = self.user_id
-        if hasattr(self, "ip_address"):
-            extra["ip_address"] = self.ip_address
-        
-        kwargs["extra"] = extra
+        extra = kwargs.get("extra")
+        kwargs["extra"] = {**self._context_extra, **extra} if extra else self._context_extra
         return msg, kwargs
 
 
@@ -182,25 +321,28 @@ def get_task_logger(**context) -> LoggerAdapter:
 class AuditLogger:
     """Logger for audit trail"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.logger = logging.getLogger("audit")
         self.logger.setLevel(logging.INFO)
         
         # Ensure audit logs are always written to file
         if settings.log_file:
             audit_file = Path(settings.log_file).parent / "audit.log"
-            handler = logging.handlers.RotatingFileHandler(
+            audit_file.parent.mkdir(parents=True, exist_ok=True)
+            handler = BufferedRotatingFileHandler(
                 audit_file,
                 maxBytes=settings.log_max_bytes,
                 backupCount=settings.log_backup_count
             )
             handler.setFormatter(JSONFormatter())
-            self.logger.addHandler(handler)
+            self.logger.addHandler(_queue_handler("audit", handler))
     
-    def log_login(self, user_id: str, ip_address: str, success: bool):
+    def log_login(self, user_id: str, ip_address: str, success: bool) -> None:
         """Log login attempt"""
         self.logger.info(
-            f"Login {'successful' if success else 'failed'} for user {user_id}",
+            "Login %s for user %s",
+            "successful" if success else "failed",
+            user_id,
             extra={
                 "event": "login",
                 "user_id": user_id,
@@ -215,10 +357,12 @@ class AuditLogger:
         order_id: str, 
         amount: float, 
         status: str
-    ):
+    ) -> None:
         """Log payment transaction"""
         self.logger.info(
-            f"Payment {status} for order {order_id}",
+            "Payment %s for order %s",
+            status,
+            order_id,
             extra={
                 "event": "payment",
                 "user_id": user_id,
@@ -234,10 +378,12 @@ class AuditLogger:
         resource: str, 
         action: str, 
         success: bool
-    ):
+    ) -> None:
         """Log data access"""
         self.logger.info(
-            f"Data access: {action} on {resource}",
+            "Data access: %s on %s",
+            action,
+            resource,
             extra={
                 "event": "data_access",
                 "user_id": user_id,
@@ -253,10 +399,12 @@ class AuditLogger:
         action: str, 
         target: str, 
         details: dict
-    ):
+    ) -> None:
         """Log admin action"""
         self.logger.warning(
-            f"Admin action: {action} on {target}",
+            "Admin action: %s on %s",
+            action,
+            target,
             extra={
                 "event": "admin_action",
                 "admin_id": admin_id,
@@ -267,5 +415,17 @@ class AuditLogger:
         )
 
 
-# Create singleton audit logger
-audit_logger = AuditLogger()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_audit_logger() -> AuditLogger:
+    """
+    Get the audit logger
+    Created on first use so importing this module does not open the audit file
+    """
+    return AuditLogger()
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatible access to the old module-level audit_logger
+    if name == "audit_logger":
+        return get_audit_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
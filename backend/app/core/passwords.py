@@ -0,0 +1,44 @@
+"""
+Password Hashing for NitePutter Pro
+Kept free of settings so models can hash passwords without a configured app
+"""
+
+from passlib.context import CryptContext
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Password hashing context
+# New hashes use argon2id; existing bcrypt hashes still verify and are
+# reported by needs_update() so they can be rehashed on next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    default="argon2",
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password using argon2id"""
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash, False for malformed hashes"""
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except Exception as e:
+        logger.error("Password verification error: %s", e)
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a hash is legacy bcrypt or uses outdated argon2 parameters"""
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except ValueError:
+        return False
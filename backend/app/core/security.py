@@ -4,43 +4,128 @@ JWT authentication and password management
 """
 
 from datetime import datetime, timedelta, UTC
-from typing import Optional, Dict, Any, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Dict, Any, Tuple, Union
+from calendar import timegm
+from collections import OrderedDict
+from hashlib import blake2b, sha256
+import base64
+import hmac
+import os
+import orjson
+import jwt
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
 import secrets
+import string
 import re
 import logging
+import threading
+import time
 
-from ..config import settings
+from .config import settings
+from .passwords import pwd_context, hash_password, verify_password
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS
-)
+# Character classes checked by Security.validate_password
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Basic email format check used by Security.sanitize_email
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$').match
+
+# Recently verified tokens, keyed on (token digest, token type)
+DECODE_CACHE_SIZE = 4096
+DECODE_CACHE_TTL = 60.0
+_decode_cache: "OrderedDict[Tuple[bytes, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+
+
+def _token_digest(token: str) -> bytes:
+    return blake2b(token.encode(), digest_size=16).digest()
+
+
+class _EntropyPool:
+    """Slices random bytes from a buffer refilled with one os.urandom call"""
+    
+    REFILL_SIZE = 4096
+    
+    def __init__(self) -> None:
+        self._buf = b""
+        self._lock = threading.Lock()
+    
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            if len(self._buf) < n:
+                self._buf = os.urandom(max(self.REFILL_SIZE, n))
+            out, self._buf = self._buf[:n], self._buf[n:]
+            return out
+    
+    def reset(self) -> None:
+        # A forked child must not reuse the parent's buffered bytes
+        self._buf = b""
+        self._lock = threading.Lock()
+
+
+_entropy_pool = _EntropyPool()
+os.register_at_fork(after_in_child=_entropy_pool.reset)
+
+
+def _token_urlsafe(nbytes: int) -> str:
+    """Pooled equivalent of secrets.token_urlsafe for high-frequency IDs"""
+    return base64.urlsafe_b64encode(_entropy_pool.take(nbytes)).rstrip(b"=").decode("ascii")
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Encoded header shared by every HS256 token
+_JWT_HEADER_HS256 = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+_JWT_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _encode_jwt(payload: Dict[str, Any], key: str, algorithm: str) -> str:
+    """
+    Encode a JWT, building HS256 tokens directly from the cached header
+    Other algorithms go through PyJWT
+    """
+    if algorithm != "HS256":
+        return jwt.encode(payload, key, algorithm=algorithm)
+    
+    # Same as PyJWT: datetime time claims become integer epoch seconds
+    for claim in _JWT_TIME_CLAIMS:
+        value = payload.get(claim)
+        if isinstance(value, datetime):
+            payload = {**payload, claim: timegm(value.utctimetuple())}
+    
+    signing_input = _JWT_HEADER_HS256 + b"." + _b64url(orjson.dumps(payload))
+    signature = hmac.new(key.encode(), signing_input, sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
 
 # HTTP Bearer for JWT
-security_scheme = HTTPBearer()
+security_scheme = HTTPBearer(auto_error=True)
+# Optional variant: returns None instead of raising when no bearer token is sent
+security_scheme_optional = HTTPBearer(auto_error=False)
 
 class Security:
     """Complete security implementation for authentication"""
     
     # Token settings
-    SECRET_KEY = settings.JWT_SECRET_KEY
-    REFRESH_SECRET_KEY = settings.JWT_REFRESH_SECRET_KEY
-    ALGORITHM = settings.JWT_ALGORITHM
-    ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
-    REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+    SECRET_KEY = settings.jwt_config.secret_key
+    REFRESH_SECRET_KEY = settings.jwt_config.refresh_secret_key
+    ALGORITHM = settings.jwt_config.algorithm
+    ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_config.access_token_expire_minutes
+    REFRESH_TOKEN_EXPIRE_DAYS = settings.jwt_config.refresh_token_expire_days
     
     @staticmethod
     def hash_password(password: str) -> str:
         """
-        Hash a password using bcrypt
+        Hash a password using argon2id
         
         Args:
             password: Plain text password
@@ -48,7 +133,7 @@ class Security:
         Returns:
             Hashed password string
         """
-        return pwd_context.hash(password)
+        return hash_password(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -62,11 +147,38 @@ class Security:
         Returns:
             True if password matches, False otherwise
         """
-        try:
-            return pwd_context.verify(plain_password, hashed_password)
-        except Exception as e:
-            logger.error(f"Password verification error: {e}")
-            return False
+        return verify_password(plain_password, hashed_password)
+    
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """
+        Hash a password in a worker thread
+        
+        Args:
+            password: Plain text password
+            
+        Returns:
+            Hashed password string
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, Security.hash_password, password)
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in a worker thread
+        
+        Args:
+            plain_password: Plain text password to verify
+            hashed_password: Hashed password to compare against
+            
+        Returns:
+            True if password matches, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, Security.verify_password, plain_password, hashed_password
+        )
     
     @staticmethod
     def validate_password(password: str) -> Dict[str, Any]:
@@ -79,42 +191,50 @@ class Security:
         Returns:
             Dictionary with validation results
         """
+        # Collect character classes in a single pass
+        has_upper = has_lower = has_digit = has_special = False
+        for char in password:
+            if char in _SPECIAL_CHARACTERS:
+                has_special = True
+            elif char in _UPPERCASE:
+                has_upper = True
+            elif char in _LOWERCASE:
+                has_lower = True
+            elif char.isdecimal():  # same set as the regex \d
+                has_digit = True
+            else:
+                continue
+            if has_upper and has_lower and has_digit and has_special:
+                break
+        
+        length = len(password)
         errors = []
         
         # Check minimum length
-        if len(password) < settings.PASSWORD_MIN_LENGTH:
-            errors.append(f"Password must be at least {settings.PASSWORD_MIN_LENGTH} characters long")
+        if length < settings.password_min_length:
+            errors.append(f"Password must be at least {settings.password_min_length} characters long")
         
         # Check for uppercase letter
-        if not re.search(r"[A-Z]", password):
+        if not has_upper:
             errors.append("Password must contain at least one uppercase letter")
         
         # Check for lowercase letter
-        if not re.search(r"[a-z]", password):
+        if not has_lower:
             errors.append("Password must contain at least one lowercase letter")
         
         # Check for digit
-        if not re.search(r"\d", password):
+        if not has_digit:
             errors.append("Password must contain at least one number")
         
         # Check for special character
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        if not has_special:
             errors.append("Password must contain at least one special character")
         
         # Calculate password strength score
-        score = 0
-        if len(password) >= 8:
-            score += 1
-        if len(password) >= 12:
-            score += 1
-        if re.search(r"[A-Z]", password):
-            score += 1
-        if re.search(r"[a-z]", password):
-            score += 1
-        if re.search(r"\d", password):
-            score += 1
-        if re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-            score += 1
+        score = (
+            (length >= 8) + (length >= 12)
+            + has_upper + has_lower + has_digit + has_special
+        )
         
         strength = "weak"
         if score >= 5:
@@ -132,7 +252,8 @@ class Security:
     @staticmethod
     def create_access_token(
         data: Dict[str, Any],
-        expires_delta: Optional[timedelta] = None
+        expires_delta: Optional[timedelta] = None,
+        now: Optional[datetime] = None
     ) -> str:
         """
         Create JWT access token
@@ -140,28 +261,30 @@ class Security:
         Args:
             data: Data to encode in the token
             expires_delta: Optional custom expiration time
+            now: Issue time, defaults to the current time
             
         Returns:
             Encoded JWT token string
         """
-        to_encode = data.copy()
-        
+        if now is None:
+            now = datetime.now(UTC)
         if expires_delta:
-            expire = datetime.now(UTC) + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.now(UTC) + timedelta(minutes=Security.ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = now + timedelta(minutes=Security.ACCESS_TOKEN_EXPIRE_MINUTES)
         
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.now(UTC),
+        to_encode = {
+            **data,
+            "exp": int(expire.timestamp()),
+            "iat": int(now.timestamp()),
             "type": "access",
-            "jti": secrets.token_urlsafe(16)  # JWT ID for token tracking
-        })
+            "jti": _token_urlsafe(16)  # JWT ID for token tracking
+        }
         
-        encoded_jwt = jwt.encode(
+        encoded_jwt = _encode_jwt(
             to_encode,
             Security.SECRET_KEY,
-            algorithm=Security.ALGORITHM
+            Security.ALGORITHM
         )
         
         return encoded_jwt
@@ -169,7 +292,8 @@ class Security:
     @staticmethod
     def create_refresh_token(
         data: Dict[str, Any],
-        expires_delta: Optional[timedelta] = None
+        expires_delta: Optional[timedelta] = None,
+        now: Optional[datetime] = None
     ) -> str:
         """
         Create JWT refresh token
@@ -177,28 +301,30 @@ class Security:
         Args:
             data: Data to encode in the token
             expires_delta: Optional custom expiration time
+            now: Issue time, defaults to the current time
             
         Returns:
             Encoded JWT refresh token string
         """
-        to_encode = data.copy()
-        
+        if now is None:
+            now = datetime.now(UTC)
         if expires_delta:
-            expire = datetime.now(UTC) + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.now(UTC) + timedelta(days=Security.REFRESH_TOKEN_EXPIRE_DAYS)
+            expire = now + timedelta(days=Security.REFRESH_TOKEN_EXPIRE_DAYS)
         
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.now(UTC),
+        to_encode = {
+            **data,
+            "exp": int(expire.timestamp()),
+            "iat": int(now.timestamp()),
             "type": "refresh",
-            "jti": secrets.token_urlsafe(16)  # JWT ID for token revocation
-        })
+            "jti": _token_urlsafe(16)  # JWT ID for token revocation
+        }
         
-        encoded_jwt = jwt.encode(
+        encoded_jwt = _encode_jwt(
             to_encode,
             Security.REFRESH_SECRET_KEY,
-            algorithm=Security.ALGORITHM
+            Security.ALGORITHM
         )
         
         return encoded_jwt
@@ -218,6 +344,17 @@ class Security:
         Raises:
             HTTPException: If token is invalid or expired
         """
+        key = (_token_digest(token), token_type)
+        now = time.time()
+        with _decode_cache_lock:
+            cached = _decode_cache.get(key)
+            if cached is not None:
+                if cached[0] > now:
+                    _decode_cache.move_to_end(key)
+                    # Callers may mutate the payload; never hand out the cached dict
+                    return dict(cached[1])
+                del _decode_cache[key]
+        
         try:
             # Select appropriate secret key
             secret_key = Security.SECRET_KEY if token_type == "access" else Security.REFRESH_SECRET_KEY
@@ -236,20 +373,40 @@ class Security:
                     detail="Invalid token type"
                 )
             
-            return payload
+            # Cache until the token expires, at most DECODE_CACHE_TTL seconds
+            expires_at = min(payload.get("exp", now), now + DECODE_CACHE_TTL)
+            with _decode_cache_lock:
+                _decode_cache[key] = (expires_at, payload)
+                if len(_decode_cache) > DECODE_CACHE_SIZE:
+                    _decode_cache.popitem(last=False)
+            
+            return dict(payload)
             
-        except jwt.ExpiredSignatureError:
+        except ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired"
             )
-        except jwt.JWTError as e:
-            logger.error(f"JWT decode error: {e}")
+        except InvalidTokenError as e:
+            logger.error("JWT decode error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
             )
     
+    @staticmethod
+    def forget_token(token: str) -> None:
+        """
+        Drop a token from the decode cache, e.g. after it is revoked
+        
+        Args:
+            token: JWT token to forget
+        """
+        digest = _token_digest(token)
+        with _decode_cache_lock:
+            _decode_cache.pop((digest, "access"), None)
+            _decode_cache.pop((digest, "refresh"), None)
+    
     @staticmethod
     def verify_token(credentials: HTTPAuthorizationCredentials) -> Dict[str, Any]:
         """
@@ -321,15 +478,18 @@ class Security:
         Returns:
             Dictionary with access_token and refresh_token
         """
+        # Both tokens share one issue time
+        now = datetime.now(UTC)
+        
         # Create access token
-        access_token = Security.create_access_token(user_data)
+        access_token = Security.create_access_token(user_data, now=now)
         
         # Create refresh token with minimal data
         refresh_data = {
             "sub": user_data.get("sub"),  # User ID
             "email": user_data.get("email")
         }
-        refresh_token = Security.create_refresh_token(refresh_data)
+        refresh_token = Security.create_refresh_token(refresh_data, now=now)
         
         return {
             "access_token": access_token,
@@ -365,7 +525,7 @@ class Security:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Token refresh error: {e}")
+            logger.error("Token refresh error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
@@ -377,22 +537,32 @@ class Security:
         Get information about a password hash
         
         Args:
-            hashed_password: Bcrypt hashed password
+            hashed_password: Argon2 or bcrypt hashed password
             
         Returns:
             Dictionary with hash information
         """
         try:
-            # Bcrypt format: $2b$[rounds]$[salt][hash]
-            parts = hashed_password.split("$")
-            if len(parts) >= 4:
+            # Bcrypt format: $2b$[rounds]$[salt][hash], fixed width prefix
+            if hashed_password[:2] == "$2" and hashed_password[3:4] == "$" and hashed_password[6:7] == "$":
+                # bcrypt is deprecated in pwd_context, so always rehash
+                return {
+                    "algorithm": hashed_password[1:3],
+                    "rounds": int(hashed_password[4:6]),
+                    "needs_rehash": True
+                }
+            
+            # Argon2 format: $argon2id$v=19$m=65536,t=3,p=4$[salt]$[hash]
+            if hashed_password.startswith("$argon2"):
+                parts = hashed_password.split("$", 5)
+                params = dict(param.split("=", 1) for param in parts[3].split(","))
                 return {
                     "algorithm": parts[1],
-                    "rounds": int(parts[2]),
+                    "rounds": int(params["t"]),
                     "needs_rehash": pwd_context.needs_update(hashed_password)
                 }
         except Exception as e:
-            logger.error(f"Hash info error: {e}")
+            logger.error("Hash info error: %s", e)
         
         return {"algorithm": "unknown", "rounds": 0, "needs_rehash": True}
     
@@ -407,12 +577,11 @@ class Security:
         Returns:
             Sanitized email address
         """
-        # Convert to lowercase and strip whitespace
-        email = email.lower().strip()
+        # Strip whitespace and convert to lowercase
+        email = email.strip().lower()
         
         # Basic email validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE(email):
             raise ValueError("Invalid email format")
         
         return email
@@ -455,7 +624,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 # Dependency for optional authentication
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme_optional)
 ) -> Optional[Dict[str, Any]]:
     """
     Dependency to optionally get current user
@@ -3,19 +3,42 @@ MongoDB Database Connection and Configuration
 Production-ready database setup for NitePutter Pro
 """
 
-import os
+import time
+from decimal import Decimal
 from typing import Optional, List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT, GEO2D
+from bson.codec_options import TypeCodec, TypeRegistry
+from bson.decimal128 import Decimal128
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING, TEXT, GEO2D
+from pymongo.results import BulkWriteResult
 from pymongo.errors import ConnectionFailure, OperationFailure
 import logging
 from datetime import datetime
 
+from .core.config import settings
+
 logger = logging.getLogger(__name__)
 
+class DecimalCodec(TypeCodec):
+    """Store Decimal as BSON Decimal128 and read it back as Decimal"""
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> Decimal128:
+        return Decimal128(value)
+
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+type_registry = TypeRegistry([DecimalCodec()])
+
+# Collections whose handles are bound once at connect time
+COLLECTION_NAMES = ("products", "orders", "users", "carts", "reviews", "inventory")
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    collections: Dict[str, AsyncIOMotorCollection] = {}
 
 db = Database()
 
@@ -24,8 +47,8 @@ async def connect_to_mongodb():
     max_retries = 3
     retry_count = 0
     
-    mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    database_name = os.getenv("DATABASE_NAME", "niteputter_pro")
+    mongodb_url = settings.database_url
+    database_name = settings.test_database_name if settings.is_testing else settings.mongodb_db_name
     
     while retry_count < max_retries:
         try:
@@ -41,13 +64,18 @@ async def connect_to_mongodb():
                 retryWrites=True,
                 w="majority",
                 journal=True,
-                readPreference="primaryPreferred"
+                readPreference="primaryPreferred",
+                # Wire compression, negotiated with the server in this order
+                compressors="zstd,zlib",
+                zlibCompressionLevel=6,
+                type_registry=type_registry
             )
             
             # Verify connection
             await db.client.admin.command('ping')
             
             db.database = db.client[database_name]
+            db.collections = {name: db.database[name] for name in COLLECTION_NAMES}
             
             logger.info(f"Successfully connected to MongoDB database: {database_name}")
             
@@ -71,144 +99,175 @@ async def close_mongodb_connection():
     """Close MongoDB connection"""
     if db.client:
         db.client.close()
+        db.collections = {}
         logger.info("Disconnected from MongoDB")
 
+def _index(keys, **kwargs) -> IndexModel:
+    """Index built in the background so existing collections stay writable"""
+    return IndexModel(keys, background=True, **kwargs)
+
+# Indexes per collection, created by create_indexes()
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    # Product indexes
+    "products": [
+        _index([("sku", ASCENDING)], unique=True, name="sku_unique"),
+        _index([("slug", ASCENDING)], unique=True, name="slug_unique"),
+        _index([("status", ASCENDING)], name="status_index"),
+        _index([("price", ASCENDING)], name="price_index"),
+        _index([("created_at", DESCENDING)], name="created_at_index"),
+        _index([("average_rating", DESCENDING)], name="rating_index"),
+        # Serves the $text queries in database/product_repository.py
+        _index([
+            ("name", TEXT),
+            ("description", TEXT),
+            ("short_description", TEXT),
+            ("features", TEXT)
+        ], name="text_search_index"),
+        # Price filter variant: category/status listings filtered or sorted by price
+        _index([
+            ("category", ASCENDING),
+            ("status", ASCENDING),
+            ("price", ASCENDING)
+        ], name="category_status_price_compound"),
+        # Newest-first category/status listings, sort served by the index
+        _index([
+            ("category", ASCENDING),
+            ("status", ASCENDING),
+            ("created_at", DESCENDING)
+        ], name="cat_status_created_compound")
+    ],
+    # Order indexes
+    "orders": [
+        _index([("order_number", ASCENDING)], unique=True, name="order_number_unique"),
+        _index([("customer_email", ASCENDING)], name="customer_email_index"),
+        _index([("payment_status", ASCENDING)], name="payment_status_index"),
+        _index([("fulfillment_status", ASCENDING)], name="fulfillment_status_index"),
+        _index([("created_at", DESCENDING)], name="order_created_at_index"),
+        _index([("customer_id", ASCENDING)], name="customer_id_index"),
+        _index([
+            ("status", ASCENDING),
+            ("created_at", DESCENDING)
+        ], name="status_date_compound"),
+        _index([
+            ("customer_email", ASCENDING),
+            ("created_at", DESCENDING)
+        ], name="email_date_compound")
+    ],
+    # User indexes
+    "users": [
+        _index([("email", ASCENDING)], unique=True, name="email_unique"),
+        _index([("username", ASCENDING)], unique=True, sparse=True, name="username_unique"),
+        _index([("created_at", DESCENDING)], name="user_created_at_index"),
+        _index([("is_active", ASCENDING)], name="active_users_index"),
+        _index([("role", ASCENDING)], name="user_role_index")
+    ],
+    # Cart indexes
+    "carts": [
+        _index([("session_id", ASCENDING)], unique=True, name="session_id_unique"),
+        _index([("user_id", ASCENDING)], sparse=True, name="cart_user_id_index"),
+        # Abandonment sweep: equality on status, newest updated_at first
+        _index(
+            [("status", ASCENDING), ("updated_at", DESCENDING)],
+            name="cart_status_updated_compound",
+            partialFilterExpression={"status": "active"}
+        ),
+        # TTL: MongoDB deletes each cart once its expires_at has passed
+        _index([("expires_at", ASCENDING)], name="cart_expiry_ttl", expireAfterSeconds=0)
+    ],
+    # Review indexes
+    "reviews": [
+        _index([("customer_id", ASCENDING)], name="review_customer_index"),
+        _index([("rating", DESCENDING)], name="review_rating_index"),
+        _index([("created_at", DESCENDING)], name="review_date_index"),
+        _index([("verified_purchase", ASCENDING)], name="verified_purchase_index"),
+        _index([
+            ("product_id", ASCENDING),
+            ("rating", DESCENDING)
+        ], name="product_rating_compound")
+    ],
+    # Inventory tracking indexes
+    "inventory": [
+        _index([("product_id", ASCENDING)], unique=True, name="inventory_product_unique"),
+        _index([("quantity", ASCENDING)], name="inventory_quantity_index"),
+        _index([("low_stock_alert", ASCENDING)], name="low_stock_index"),
+        _index([("last_restocked", DESCENDING)], name="restock_date_index")
+    ],
+    # Coupon indexes
+    "coupons": [
+        _index([("code", ASCENDING)], unique=True, name="coupon_code_unique"),
+        _index([("valid_from", ASCENDING)], name="coupon_valid_from_index"),
+        # Only active coupons are looked up by validity window
+        _index(
+            [("valid_until", ASCENDING)],
+            name="coupon_valid_until_active",
+            partialFilterExpression={"is_active": True}
+        )
+    ],
+    # Analytics indexes
+    "analytics": [
+        _index([("event_type", ASCENDING)], name="event_type_index"),
+        _index([("timestamp", DESCENDING)], name="analytics_timestamp_index"),
+        _index([("user_id", ASCENDING)], sparse=True, name="analytics_user_index"),
+        _index([("session_id", ASCENDING)], name="analytics_session_index"),
+        _index([
+            ("event_type", ASCENDING),
+            ("timestamp", DESCENDING)
+        ], name="event_time_compound")
+    ]
+}
+
+# Indexes no longer in INDEX_SPECS, dropped from existing deployments
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    # Prefixes of category_status_price_compound / status_date_compound /
+    # product_rating_compound
+    "products": ["category_index"],
+    "orders": ["order_status_index"],
+    # Replaced by the cart_expiry_ttl TTL index and cart_status_updated_compound
+    "carts": ["cart_expiry_index", "cart_updated_at_index"],
+    # Replaced by the coupon_valid_until_active partial index
+    "coupons": ["coupon_valid_until_index", "coupon_active_index"],
+    "reviews": ["review_product_index"]
+}
+
+async def _drop_index(collection_name: str, index_name: str):
+    """Drop an index, ignoring ones that are already gone"""
+    try:
+        await db.database[collection_name].drop_index(index_name)
+        logger.info(f"Dropped obsolete index {collection_name}.{index_name}")
+    except OperationFailure:
+        pass
+
 async def create_indexes():
     """Create database indexes for optimal performance"""
-    try:
-        # Product indexes
-        product_indexes = [
-            IndexModel([("sku", ASCENDING)], unique=True, name="sku_unique"),
-            IndexModel([("slug", ASCENDING)], unique=True, name="slug_unique"),
-            IndexModel([("category", ASCENDING)], name="category_index"),
-            IndexModel([("status", ASCENDING)], name="status_index"),
-            IndexModel([("price", ASCENDING)], name="price_index"),
-            IndexModel([("created_at", DESCENDING)], name="created_at_index"),
-            IndexModel([("average_rating", DESCENDING)], name="rating_index"),
-            IndexModel([
-                ("name", TEXT),
-                ("description", TEXT),
-                ("short_description", TEXT),
-                ("features", TEXT)
-            ], name="text_search_index"),
-            IndexModel([
-                ("category", ASCENDING),
-                ("status", ASCENDING),
-                ("price", ASCENDING)
-            ], name="category_status_price_compound")
-        ]
-        
-        await db.database.products.create_indexes(product_indexes)
-        logger.info("Created product indexes")
-        
-        # Order indexes
-        order_indexes = [
-            IndexModel([("order_number", ASCENDING)], unique=True, name="order_number_unique"),
-            IndexModel([("customer_email", ASCENDING)], name="customer_email_index"),
-            IndexModel([("status", ASCENDING)], name="order_status_index"),
-            IndexModel([("payment_status", ASCENDING)], name="payment_status_index"),
-            IndexModel([("fulfillment_status", ASCENDING)], name="fulfillment_status_index"),
-            IndexModel([("created_at", DESCENDING)], name="order_created_at_index"),
-            IndexModel([("customer_id", ASCENDING)], name="customer_id_index"),
-            IndexModel([
-                ("status", ASCENDING),
-                ("created_at", DESCENDING)
-            ], name="status_date_compound"),
-            IndexModel([
-                ("customer_email", ASCENDING),
-                ("created_at", DESCENDING)
-            ], name="email_date_compound")
-        ]
-        
-        await db.database.orders.create_indexes(order_indexes)
-        logger.info("Created order indexes")
-        
-        # User indexes
-        user_indexes = [
-            IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
-            IndexModel([("username", ASCENDING)], unique=True, sparse=True, name="username_unique"),
-            IndexModel([("created_at", DESCENDING)], name="user_created_at_index"),
-            IndexModel([("is_active", ASCENDING)], name="active_users_index"),
-            IndexModel([("role", ASCENDING)], name="user_role_index")
-        ]
-        
-        await db.database.users.create_indexes(user_indexes)
-        logger.info("Created user indexes")
-        
-        # Cart indexes
-        cart_indexes = [
-            IndexModel([("session_id", ASCENDING)], unique=True, name="session_id_unique"),
-            IndexModel([("user_id", ASCENDING)], sparse=True, name="cart_user_id_index"),
-            IndexModel([("updated_at", ASCENDING)], name="cart_updated_at_index"),
-            IndexModel([("expires_at", ASCENDING)], name="cart_expiry_index")
-        ]
-        
-        await db.database.carts.create_indexes(cart_indexes)
-        logger.info("Created cart indexes")
-        
-        # Review indexes
-        review_indexes = [
-            IndexModel([("product_id", ASCENDING)], name="review_product_index"),
-            IndexModel([("customer_id", ASCENDING)], name="review_customer_index"),
-            IndexModel([("rating", DESCENDING)], name="review_rating_index"),
-            IndexModel([("created_at", DESCENDING)], name="review_date_index"),
-            IndexModel([("verified_purchase", ASCENDING)], name="verified_purchase_index"),
-            IndexModel([
-                ("product_id", ASCENDING),
-                ("rating", DESCENDING)
-            ], name="product_rating_compound")
-        ]
-        
-        await db.database.reviews.create_indexes(review_indexes)
-        logger.info("Created review indexes")
-        
-        # Inventory tracking indexes
-        inventory_indexes = [
-            IndexModel([("product_id", ASCENDING)], unique=True, name="inventory_product_unique"),
-            IndexModel([("quantity", ASCENDING)], name="inventory_quantity_index"),
-            IndexModel([("low_stock_alert", ASCENDING)], name="low_stock_index"),
-            IndexModel([("last_restocked", DESCENDING)], name="restock_date_index")
-        ]
-        
-        await db.database.inventory.create_indexes(inventory_indexes)
-        logger.info("Created inventory indexes")
-        
-        # Coupon indexes
-        coupon_indexes = [
-            IndexModel([("code", ASCENDING)], unique=True, name="coupon_code_unique"),
-            IndexModel([("valid_from", ASCENDING)], name="coupon_valid_from_index"),
-            IndexModel([("valid_until", ASCENDING)], name="coupon_valid_until_index"),
-            IndexModel([("is_active", ASCENDING)], name="coupon_active_index")
-        ]
-        
-        await db.database.coupons.create_indexes(coupon_indexes)
-        logger.info("Created coupon indexes")
-        
-        # Analytics indexes
-        analytics_indexes = [
-            IndexModel([("event_type", ASCENDING)], name="event_type_index"),
-            IndexModel([("timestamp", DESCENDING)], name="analytics_timestamp_index"),
-            IndexModel([("user_id", ASCENDING)], sparse=True, name="analytics_user_index"),
-            IndexModel([("session_id", ASCENDING)], name="analytics_session_index"),
-            IndexModel([
-                ("event_type", ASCENDING),
-                ("timestamp", DESCENDING)
-            ], name="event_time_compound")
-        ]
-        
-        await db.database.analytics.create_indexes(analytics_indexes)
-        logger.info("Created analytics indexes")
-        
-        logger.info("All database indexes created successfully")
-        
-    except OperationFailure as e:
-        logger.error(f"Failed to create indexes: {e}")
-        # Don't fail the application if indexes exist
-        if "already exists" not in str(e):
-            raise
-    except Exception as e:
-        logger.error(f"Unexpected error creating indexes: {e}")
-        raise
+    # Drop replaced indexes first so new ones on the same keys can be built
+    await asyncio.gather(*(
+        _drop_index(collection_name, index_name)
+        for collection_name, index_names in OBSOLETE_INDEXES.items()
+        for index_name in index_names
+    ))
+    
+    # One round-trip per collection, all in flight at once
+    results = await asyncio.gather(
+        *(
+            db.database[collection_name].create_indexes(indexes)
+            for collection_name, indexes in INDEX_SPECS.items()
+        ),
+        return_exceptions=True
+    )
+    
+    for collection_name, result in zip(INDEX_SPECS, results):
+        if isinstance(result, OperationFailure):
+            logger.error(f"Failed to create {collection_name} indexes: {result}")
+            # Don't fail the application if indexes exist
+            if "already exists" not in str(result):
+                raise result
+        elif isinstance(result, BaseException):
+            logger.error(f"Unexpected error creating {collection_name} indexes: {result}")
+            raise result
+        else:
+            logger.info(f"Created {collection_name} indexes")
+    
+    logger.info("All database indexes created successfully")
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
@@ -216,6 +275,43 @@ async def get_database() -> AsyncIOMotorDatabase:
         await connect_to_mongodb()
     return db.database
 
+# dbStats and document counts are reused for this many seconds between probes
+HEALTH_CACHE_TTL = 5.0
+_health_cache: Dict[str, Any] = {"at": 0.0, "data": None}
+
+async def _health_stats() -> Dict[str, Any]:
+    """Database size, index and document counts, cached for HEALTH_CACHE_TTL"""
+    now = time.monotonic()
+    if _health_cache["data"] is not None and now - _health_cache["at"] < HEALTH_CACHE_TTL:
+        return _health_cache["data"]
+    
+    # Database stats and document counts, all in flight at once
+    stats, product_count, order_count, user_count = await asyncio.gather(
+        db.database.command("dbStats"),
+        db.database.products.estimated_document_count(),
+        db.database.orders.estimated_document_count(),
+        db.database.users.estimated_document_count()
+    )
+    
+    data = {
+        "database_size": stats.get("dataSize", 0),
+        "collections": {
+            "products": product_count,
+            "orders": order_count,
+            "users": user_count
+        },
+        "indexes": stats.get("indexes", 0)
+    }
+    _health_cache["at"] = now
+    _health_cache["data"] = data
+    return data
+
+async def _ping_latency() -> float:
+    """Round-trip time of a ping, in milliseconds"""
+    start = datetime.utcnow()
+    await db.client.admin.command('ping')
+    return (datetime.utcnow() - start).total_seconds() * 1000
+
 async def health_check() -> Dict[str, Any]:
     """Check database health"""
     try:
@@ -225,29 +321,14 @@ async def health_check() -> Dict[str, Any]:
                 "message": "Database not connected"
             }
         
-        # Ping database
-        start = datetime.utcnow()
-        await db.client.admin.command('ping')
-        latency = (datetime.utcnow() - start).total_seconds() * 1000
-        
-        # Get database stats
-        stats = await db.database.command("dbStats")
-        
-        # Count documents
-        product_count = await db.database.products.count_documents({})
-        order_count = await db.database.orders.count_documents({})
-        user_count = await db.database.users.count_documents({})
+        # Ping database on every probe, so latency is always fresh; the
+        # stats run alongside it
+        latency, stats = await asyncio.gather(_ping_latency(), _health_stats())
         
         return {
             "status": "healthy",
             "latency_ms": round(latency, 2),
-            "database_size": stats.get("dataSize", 0),
-            "collections": {
-                "products": product_count,
-                "orders": order_count,
-                "users": user_count
-            },
-            "indexes": stats.get("indexes", 0)
+            **stats
         }
         
     except Exception as e:
@@ -262,8 +343,11 @@ import asyncio
 
 # Collection helpers
 def get_collection(collection_name: str):
-    """Get a collection from the database"""
-    if not db.database:
+    """Get a collection from the database, using the pre-bound handle if any"""
+    collection = db.collections.get(collection_name)
+    if collection is not None:
+        return collection
+    if db.database is None:
         raise RuntimeError("Database not connected")
     return db.database[collection_name]
 
@@ -284,4 +368,19 @@ def reviews_collection():
     return get_collection("reviews")
 
 def inventory_collection():
-    return get_collection("inventory")
\ No newline at end of file
+    return get_collection("inventory")
+
+class CartRepository:
+    """Batched cart persistence"""
+    
+    async def flush(self, ops: List[UpdateOne]) -> Optional[BulkWriteResult]:
+        """
+        Send several cart updates in one round-trip
+        Unordered, so the server can apply them independently
+        """
+        if not ops:
+            return None
+        database = await get_database()
+        return await database.carts.bulk_write(ops, ordered=False)
+
+cart_repository = CartRepository()
\ No newline at end of file
@@ -5,19 +5,20 @@ Persistent cart storage with session and user support
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, ConfigDict
 from decimal import Decimal
-from enum import Enum
+from enum import StrEnum
+from .common import utc_now
 from .product import PyObjectId
 
-class CartStatus(str, Enum):
+class CartStatus(StrEnum):
     ACTIVE = "active"
     ABANDONED = "abandoned"
     CONVERTED = "converted"
     EXPIRED = "expired"
     MERGED = "merged"
 
-class CartItemStatus(str, Enum):
+class CartItemStatus(StrEnum):
     AVAILABLE = "available"
     OUT_OF_STOCK = "out_of_stock"
     LIMITED_STOCK = "limited_stock"
@@ -37,7 +38,6 @@ class CartItem(BaseModel):
     unit_price: Decimal = Field(..., gt=0)
     original_price: Optional[Decimal] = None  # For tracking price changes
     quantity: int = Field(..., gt=0)
-    subtotal: Decimal = Field(..., ge=0)
     
     # Applied discounts
     discount_amount: Decimal = Field(default=Decimal("0"))
@@ -49,19 +49,15 @@ class CartItem(BaseModel):
     reserved_until: Optional[datetime] = None
     
     # Metadata
-    added_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    added_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     notes: Optional[str] = None
     
-    @field_validator('subtotal', mode='before')
-    @classmethod
-    def calculate_subtotal(cls, v, info):
-        if info.data.get('unit_price') and info.data.get('quantity'):
-            subtotal = info.data['unit_price'] * info.data['quantity']
-            if info.data.get('discount_amount'):
-                subtotal -= info.data['discount_amount']
-            return max(Decimal("0"), subtotal)
-        return v
+    @computed_field
+    @property
+    def subtotal(self) -> Decimal:
+        """Line total before discounts, derived on access"""
+        return self.unit_price * self.quantity
 
 class AppliedCoupon(BaseModel):
     """Coupon applied to cart"""
@@ -71,7 +67,7 @@ class AppliedCoupon(BaseModel):
     discount_amount: Decimal
     min_purchase: Optional[Decimal] = None
     description: Optional[str] = None
-    applied_at: datetime = Field(default_factory=datetime.utcnow)
+    applied_at: datetime = Field(default_factory=utc_now)
 
 class CartTotals(BaseModel):
     """Cart totals calculation"""
@@ -133,14 +129,23 @@ class ShoppingCart(BaseModel):
     tags: List[str] = []
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    expires_at: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(days=30))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
+    expires_at: datetime = Field(default_factory=lambda: utc_now() + timedelta(days=30))
     converted_at: Optional[datetime] = None
     
+    # Position of each item by product_id and each coupon by code, built on
+    # first lookup and kept in step by the mutation methods
+    _item_index: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    _coupon_index: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    
+    # Build the validator at import rather than on first use, and keep the
+    # mutation methods' attribute writes unvalidated
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
+        defer_build=False,
+        validate_assignment=False,
         json_encoders={
             str: str,  # PyObjectId handled by annotation
             datetime: lambda v: v.isoformat(),
@@ -148,58 +153,101 @@ class ShoppingCart(BaseModel):
         }
     )
     
+    def _items_by_product(self) -> Dict[str, int]:
+        """Map product_id to its position in items"""
+        index = self._item_index
+        if index is None or len(index) != len(self.items):
+            index = {item.product_id: i for i, item in enumerate(self.items)}
+            self._item_index = index
+        return index
+    
+    def _coupons_by_code(self) -> Dict[str, int]:
+        """Map coupon code to its position in coupons"""
+        index = self._coupon_index
+        if index is None or len(index) != len(self.coupons):
+            index = {coupon.code: i for i, coupon in enumerate(self.coupons)}
+            self._coupon_index = index
+        return index
+    
+    def _find_item(self, product_id: str) -> Optional[int]:
+        """Position of the item for product_id, or None"""
+        i = self._items_by_product().get(product_id)
+        if i is not None and (i >= len(self.items) or self.items[i].product_id != product_id):
+            # items was changed behind our back; rebuild and retry
+            self._item_index = None
+            i = self._items_by_product().get(product_id)
+        return i
+    
+    def _pop_item(self, i: int) -> CartItem:
+        """Remove the item at position i, shifting the positions after it"""
+        index = self._items_by_product()
+        item = self.items.pop(i)
+        del index[item.product_id]
+        for j in range(i, len(self.items)):
+            index[self.items[j].product_id] = j
+        return item
+    
     def calculate_totals(self):
         """Recalculate cart totals"""
-        # Calculate subtotal
-        self.totals.subtotal = sum(item.subtotal for item in self.items)
-        self.totals.item_count = len(self.items)
-        self.totals.total_quantity = sum(item.quantity for item in self.items)
+        totals = self.totals
+        
+        # Accumulate item sums in a single pass
+        subtotal = Decimal("0")
+        total_quantity = 0
+        item_discounts = Decimal("0")
+        original_total = Decimal("0")
+        for item in self.items:
+            subtotal += item.subtotal
+            total_quantity += item.quantity
+            item_discounts += item.discount_amount
+            original_total += (item.original_price or item.unit_price) * item.quantity
+        
+        totals.subtotal = subtotal
+        totals.item_count = len(self.items)
+        totals.total_quantity = total_quantity
         
         # Calculate discounts
-        self.totals.discount_total = sum(coupon.discount_amount for coupon in self.coupons)
-        self.totals.discount_total += sum(item.discount_amount for item in self.items)
+        totals.discount_total = sum(
+            (coupon.discount_amount for coupon in self.coupons), Decimal("0")
+        ) + item_discounts
         
         # Calculate savings
-        original_total = sum(
-            (item.original_price or item.unit_price) * item.quantity 
-            for item in self.items
-        )
-        self.totals.savings_amount = original_total - self.totals.subtotal
+        totals.savings_amount = original_total - subtotal
         if original_total > 0:
-            self.totals.savings_percentage = (self.totals.savings_amount / original_total) * 100
+            totals.savings_percentage = (totals.savings_amount / original_total) * 100
         
         # Calculate total (without tax and shipping for now)
-        self.totals.total = self.totals.subtotal - self.totals.discount_total
-        self.totals.total = max(Decimal("0"), self.totals.total)
+        totals.total = max(Decimal("0"), subtotal - totals.discount_total)
         
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utc_now()
     
     def add_item(self, product: Dict[str, Any], quantity: int = 1) -> CartItem:
         """Add item to cart"""
         # Check if item already exists
-        existing_item = None
-        for item in self.items:
-            if item.product_id == product["id"]:
-                existing_item = item
-                break
+        i = self._find_item(product["id"])
+        existing_item = self.items[i] if i is not None else None
         
         if existing_item:
             # Update quantity
             existing_item.quantity += quantity
-            existing_item.subtotal = existing_item.unit_price * existing_item.quantity
-            existing_item.updated_at = datetime.utcnow()
+            existing_item.updated_at = utc_now()
         else:
-            # Create new item
+            # Create new item, parsing each price once
+            unit_price = Decimal(str(product["price"]))
+            compare_at_price = product.get("compare_at_price")
+            original_price = (
+                Decimal(str(compare_at_price)) if compare_at_price is not None else unit_price
+            )
             new_item = CartItem(
                 product_id=product["id"],
                 product_sku=product["sku"],
                 product_name=product["name"],
                 product_image=product.get("image"),
-                unit_price=Decimal(str(product["price"])),
-                original_price=Decimal(str(product.get("compare_at_price", product["price"]))),
-                quantity=quantity,
-                subtotal=Decimal(str(product["price"])) * quantity
+                unit_price=unit_price,
+                original_price=original_price,
+                quantity=quantity
             )
+            self._items_by_product()[new_item.product_id] = len(self.items)
             self.items.append(new_item)
             existing_item = new_item
         
@@ -208,31 +256,34 @@ class ShoppingCart(BaseModel):
     
     def update_item_quantity(self, product_id: str, quantity: int) -> bool:
         """Update item quantity"""
-        for item in self.items:
-            if item.product_id == product_id:
-                if quantity <= 0:
-                    self.items.remove(item)
-                else:
-                    item.quantity = quantity
-                    item.subtotal = item.unit_price * quantity
-                    item.updated_at = datetime.utcnow()
-                self.calculate_totals()
-                return True
-        return False
+        i = self._find_item(product_id)
+        if i is None:
+            return False
+        
+        if quantity <= 0:
+            self._pop_item(i)
+        else:
+            item = self.items[i]
+            item.quantity = quantity
+            item.updated_at = utc_now()
+        self.calculate_totals()
+        return True
     
     def remove_item(self, product_id: str) -> bool:
         """Remove item from cart"""
-        for item in self.items:
-            if item.product_id == product_id:
-                self.items.remove(item)
-                self.calculate_totals()
-                return True
-        return False
+        i = self._find_item(product_id)
+        if i is None:
+            return False
+        
+        self._pop_item(i)
+        self.calculate_totals()
+        return True
     
     def apply_coupon(self, coupon: Dict[str, Any]) -> bool:
         """Apply coupon to cart"""
         # Check if already applied
-        if any(c.code == coupon["code"] for c in self.coupons):
+        coupon_index = self._coupons_by_code()
+        if coupon["code"] in coupon_index:
             return False
         
         # Check minimum purchase
@@ -257,23 +308,30 @@ class ShoppingCart(BaseModel):
             description=coupon.get("description")
         )
         
+        coupon_index[applied_coupon.code] = len(self.coupons)
         self.coupons.append(applied_coupon)
         self.calculate_totals()
         return True
     
     def remove_coupon(self, code: str) -> bool:
         """Remove coupon from cart"""
-        for coupon in self.coupons:
-            if coupon.code == code:
-                self.coupons.remove(coupon)
-                self.calculate_totals()
-                return True
-        return False
+        coupon_index = self._coupons_by_code()
+        i = coupon_index.pop(code, None)
+        if i is None:
+            return False
+        
+        del self.coupons[i]
+        for j in range(i, len(self.coupons)):
+            coupon_index[self.coupons[j].code] = j
+        self.calculate_totals()
+        return True
     
     def clear(self):
         """Clear all items from cart"""
         self.items = []
         self.coupons = []
+        self._item_index = {}
+        self._coupon_index = {}
         self.calculate_totals()
     
     def merge_with(self, other_cart: 'ShoppingCart'):
@@ -293,21 +351,21 @@ class ShoppingCart(BaseModel):
     
     def is_expired(self) -> bool:
         """Check if cart has expired"""
-        return self.expires_at < datetime.utcnow()
+        return self.expires_at < utc_now()
     
     def is_abandoned(self) -> bool:
         """Check if cart is abandoned (not updated for 1 hour)"""
-        return (datetime.utcnow() - self.updated_at).total_seconds() > 3600
+        return (utc_now() - self.updated_at).total_seconds() > 3600
     
     def mark_as_converted(self, order_id: str):
         """Mark cart as converted to order"""
         self.status = CartStatus.CONVERTED
-        self.converted_at = datetime.utcnow()
+        self.converted_at = utc_now()
         self.notes = f"Converted to order: {order_id}"
     
     def reserve_stock(self, duration_minutes: int = 15):
         """Reserve stock for items in cart"""
-        reservation_expires = datetime.utcnow() + timedelta(minutes=duration_minutes)
+        reservation_expires = utc_now() + timedelta(minutes=duration_minutes)
         for item in self.items:
             item.reserved_until = reservation_expires
 
@@ -0,0 +1,67 @@
+"""
+Shared Models for NitePutter Pro
+Types used by more than one document model
+"""
+
+from typing import Optional, Annotated
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from pydantic import BaseModel, AfterValidator
+import re
+import time
+
+# Syntactic email check for stored documents; request schemas keep EmailStr
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def validate_email_syntax(v: str) -> str:
+    if not _EMAIL_RE.match(v):
+        raise ValueError("Invalid email address")
+    return v
+
+Email = Annotated[str, AfterValidator(validate_email_syntax)]
+
+_EPOCH = datetime(1970, 1, 1)
+# (millisecond tick, naive UTC datetime) of the last utc_now() call
+_clock = (0, _EPOCH)
+
+def utc_now() -> datetime:
+    """
+    Naive UTC now, like datetime.utcnow, reused within the same millisecond
+    MongoDB stores datetimes at millisecond precision, so nothing persisted
+    loses resolution
+    """
+    global _clock
+    tick = time.time_ns() // 1_000_000
+    last_tick, now = _clock
+    if tick != last_tick:
+        now = _EPOCH + timedelta(milliseconds=tick)
+        _clock = (tick, now)
+    return now
+
+def to_cents(amount: Decimal) -> int:
+    """Money amount as integer cents, as Stripe expects, rounded half up"""
+    return int((Decimal(amount) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+def from_cents(cents: int) -> Decimal:
+    """Integer cents as an exact two-place Decimal"""
+    return Decimal(cents).scaleb(-2)
+
+class Address(BaseModel):
+    """Postal address, used for order shipping/billing and saved user addresses"""
+    label: str = "default"  # home, work, etc
+    first_name: str
+    last_name: str
+    company: Optional[str] = None
+    street_line1: str
+    street_line2: Optional[str] = None
+    city: str
+    state_province: str
+    postal_code: str
+    country: str = "US"
+    phone: str
+    is_residential: bool = True
+    
+    # Saved address flags
+    is_default: bool = False
+    is_billing: bool = False
+    is_shipping: bool = False
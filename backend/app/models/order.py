@@ -4,13 +4,17 @@ Complete order processing and tracking system
 """
 
 from typing import Optional, List, Dict, Any
-from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from decimal import Decimal
-from enum import Enum
+from enum import StrEnum
+from .common import Address, Email, utc_now
 from .product import PyObjectId
+from functools import lru_cache
+import random
+import time
 
-class OrderStatus(str, Enum):
+class OrderStatus(StrEnum):
     PENDING = "pending"
     PROCESSING = "processing"
     PAID = "paid"
@@ -20,7 +24,7 @@ class OrderStatus(str, Enum):
     REFUNDED = "refunded"
     PARTIALLY_REFUNDED = "partially_refunded"
 
-class PaymentStatus(str, Enum):
+class PaymentStatus(StrEnum):
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
@@ -28,13 +32,13 @@ class PaymentStatus(str, Enum):
     REFUNDED = "refunded"
     PARTIALLY_REFUNDED = "partially_refunded"
 
-class PaymentMethod(str, Enum):
+class PaymentMethod(StrEnum):
     STRIPE = "stripe"
     PAYPAL = "paypal"
     APPLE_PAY = "apple_pay"
     GOOGLE_PAY = "google_pay"
 
-class FulfillmentStatus(str, Enum):
+class FulfillmentStatus(StrEnum):
     UNFULFILLED = "unfulfilled"
     PARTIALLY_FULFILLED = "partially_fulfilled"
     FULFILLED = "fulfilled"
@@ -42,25 +46,14 @@ class FulfillmentStatus(str, Enum):
     DELIVERED = "delivered"
     RETURNED = "returned"
 
-class ShippingMethod(str, Enum):
+class ShippingMethod(StrEnum):
     STANDARD = "standard"
     EXPRESS = "express"
     OVERNIGHT = "overnight"
     PICKUP = "pickup"
 
-class Address(BaseModel):
-    """Shipping/Billing address"""
-    first_name: str
-    last_name: str
-    company: Optional[str] = None
-    street_line1: str
-    street_line2: Optional[str] = None
-    city: str
-    state_province: str
-    postal_code: str
-    country: str = "US"
-    phone: str
-    is_residential: bool = True
+# Statuses in which an order can still be cancelled
+_CANCELLABLE_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING})
 
 class OrderItem(BaseModel):
     """Individual order line item"""
@@ -73,33 +66,29 @@ class OrderItem(BaseModel):
     price: Decimal = Field(..., gt=0)
     compare_at_price: Optional[Decimal] = None
     quantity: int = Field(..., gt=0)
-    subtotal: Decimal = Field(..., gt=0)
+    # Derived from price, quantity, tax and discount after validation
+    subtotal: Decimal = Field(default=Decimal("0"), ge=0)
     tax_amount: Decimal = Field(default=Decimal("0"))
     discount_amount: Decimal = Field(default=Decimal("0"))
-    total: Decimal = Field(..., gt=0)
+    total: Decimal = Field(default=Decimal("0"), ge=0)
     fulfillment_status: FulfillmentStatus = FulfillmentStatus.UNFULFILLED
     fulfilled_quantity: int = 0
     
-    @field_validator('subtotal', mode='before')
-    @classmethod
-    def calculate_subtotal(cls, v, info):
-        if info.data.get('price') and info.data.get('quantity'):
-            return info.data['price'] * info.data['quantity']
-        return v
-    
-    @field_validator('total', mode='before')
-    @classmethod
-    def calculate_total(cls, v, info):
-        if info.data.get('subtotal'):
-            total = info.data['subtotal']
-            if info.data.get('tax_amount'):
-                total += info.data['tax_amount']
-            if info.data.get('discount_amount'):
-                total -= info.data['discount_amount']
-            return max(Decimal("0"), total)
-        return v
+    def model_post_init(self, __context: Any) -> None:
+        self.subtotal = self.price * self.quantity
+        self.total = max(Decimal("0"), self.subtotal + self.tax_amount - self.discount_amount)
+
+@lru_cache(maxsize=1)
+def _order_date(day: int) -> str:
+    """YYYYMMDD for a UTC day number, formatted once per day"""
+    return datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y%m%d")
 
-class ShippingInfo(BaseModel):
+def generate_order_number() -> str:
+    """Generate order number: NPP-YYYYMMDD-XXXX"""
+    # Random suffix: a per-process counter would collide across workers
+    return f"NPP-{_order_date(int(time.time()) // 86400)}-{random.randint(1000, 9999)}"
+
+class OrderShippingInfo(BaseModel):
     """Shipping details"""
     method: ShippingMethod
     carrier: Optional[str] = None  # "USPS", "UPS", "FedEx"
@@ -147,11 +136,14 @@ class Order(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     
     # Order identification
-    order_number: str = Field(..., description="Human-readable order number")
+    order_number: str = Field(
+        default_factory=generate_order_number,
+        description="Human-readable order number"
+    )
     
     # Customer information
     customer_id: Optional[str] = None
-    customer_email: EmailStr
+    customer_email: Email
     customer_phone: str
     customer_note: Optional[str] = None
     
@@ -167,13 +159,13 @@ class Order(BaseModel):
     shipping_total: Decimal = Field(default=Decimal("0"))
     tax_total: Decimal = Field(default=Decimal("0"))
     discount_total: Decimal = Field(default=Decimal("0"))
-    total: Decimal = Field(..., description="Final order total")
+    total: Decimal = Field(default=Decimal("0"), description="Final order total")
     
     # Payment
     payment: PaymentInfo
     
     # Shipping
-    shipping: ShippingInfo
+    shipping: OrderShippingInfo
     
     # Discounts
     discounts: List[DiscountInfo] = []
@@ -195,15 +187,17 @@ class Order(BaseModel):
     admin_notes: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     processed_at: Optional[datetime] = None
     cancelled_at: Optional[datetime] = None
     closed_at: Optional[datetime] = None
     
+    # Core schema is built on first validation instead of at import
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
+        defer_build=True,
         json_encoders={
             str: str,  # PyObjectId handled by annotation
             datetime: lambda v: v.isoformat(),
@@ -211,38 +205,28 @@ class Order(BaseModel):
         }
     )
     
-    @field_validator('order_number', mode='before')
-    @classmethod
-    def generate_order_number(cls, v):
-        if not v:
-            # Generate order number: NPP-YYYYMMDD-XXXX
-            import random
-            from datetime import datetime
-            date_str = datetime.utcnow().strftime("%Y%m%d")
-            random_suffix = str(random.randint(1000, 9999))
-            return f"NPP-{date_str}-{random_suffix}"
-        return v
-    
-    @field_validator('total', mode='before')
-    @classmethod
-    def calculate_order_total(cls, v, info):
-        if info.data.get('subtotal'):
-            total = info.data['subtotal']
-            if info.data.get('shipping_total'):
-                total += info.data['shipping_total']
-            if info.data.get('tax_total'):
-                total += info.data['tax_total']
-            if info.data.get('discount_total'):
-                total -= info.data['discount_total']
-            return max(Decimal("0"), total)
-        return v
+    def model_post_init(self, __context: Any) -> None:
+        if not self.order_number:
+            self.order_number = generate_order_number()
+        if self.subtotal:
+            self.total = max(
+                Decimal("0"),
+                self.subtotal + self.shipping_total + self.tax_total - self.discount_total
+            )
     
     def calculate_totals(self):
         """Recalculate all order totals"""
-        self.subtotal = sum(item.subtotal for item in self.items)
-        self.tax_total = sum(item.tax_amount for item in self.items)
-        self.discount_total = sum(item.discount_amount for item in self.items)
-        self.total = self.subtotal + self.shipping_total + self.tax_total - self.discount_total
+        # Accumulate item sums in a single pass
+        subtotal = tax_total = discount_total = Decimal("0")
+        for item in self.items:
+            subtotal += item.subtotal
+            tax_total += item.tax_amount
+            discount_total += item.discount_amount
+        
+        self.subtotal = subtotal
+        self.tax_total = tax_total
+        self.discount_total = discount_total
+        self.total = subtotal + self.shipping_total + tax_total - discount_total
         
     def get_profit_margin(self) -> Optional[Decimal]:
         """Calculate profit margin if cost data available"""
@@ -258,7 +242,7 @@ class Order(BaseModel):
     
     def can_be_cancelled(self) -> bool:
         """Check if order can be cancelled"""
-        return self.status in [OrderStatus.PENDING, OrderStatus.PROCESSING]
+        return self.status in _CANCELLABLE_STATUSES
     
     def can_be_refunded(self) -> bool:
         """Check if order can be refunded"""
@@ -9,15 +9,21 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict, BeforeValida
 from pydantic.functional_validators import AfterValidator
 from bson import ObjectId
 from decimal import Decimal
-from enum import Enum
+from enum import StrEnum
+from .common import utc_now
+import re
 
-class ProductCategory(str, Enum):
+# Slug cleanup: drop punctuation, then collapse whitespace/dash runs to one dash
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[-\s]+')
+
+class ProductCategory(StrEnum):
     BASIC = "basic"
     PRO = "pro"
     COMPLETE = "complete"
     ACCESSORIES = "accessories"
 
-class ProductStatus(str, Enum):
+class ProductStatus(StrEnum):
     ACTIVE = "active"
     DRAFT = "draft"
     ARCHIVED = "archived"
@@ -50,7 +56,7 @@ class ProductSpecification(BaseModel):
     water_resistance: str  # "IPX6 rated"
     warranty: str  # "2 year warranty"
 
-class ShippingInfo(BaseModel):
+class ProductShippingDims(BaseModel):
     """Shipping dimensions and weight"""
     weight: float = Field(..., description="Weight in pounds")
     length: float = Field(..., description="Length in inches")
@@ -104,7 +110,7 @@ class Product(BaseModel):
     specifications: ProductSpecification
     
     # Shipping
-    shipping: ShippingInfo
+    shipping: ProductShippingDims
     
     # Inventory
     inventory: InventoryInfo
@@ -117,17 +123,19 @@ class Product(BaseModel):
     review_count: int = Field(default=0, ge=0)
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     published_at: Optional[datetime] = None
     
     # Relationships
     related_products: List[str] = Field(default_factory=list, description="SKUs of related products")
     cross_sells: List[str] = Field(default_factory=list, description="SKUs for cross-selling")
     
+    # Core schema is built on first validation instead of at import
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
+        defer_build=True,
         json_encoders={
             ObjectId: str,
             datetime: lambda v: v.isoformat(),
@@ -150,11 +158,7 @@ class Product(BaseModel):
     def generate_slug(cls, v, info):
         if not v and info.data.get('name'):
             # Generate slug from name
-            import re
-            slug = info.data['name'].lower()
-            slug = re.sub(r'[^\w\s-]', '', slug)
-            slug = re.sub(r'[-\s]+', '-', slug)
-            return slug
+            return _SLUG_DASH.sub('-', _SLUG_STRIP.sub('', info.data['name'].lower()))
         return v
     
     def get_available_quantity(self) -> int:
@@ -191,7 +195,7 @@ class ProductCreate(BaseModel):
     features: List[str] = []
     whats_included: List[str] = []
     specifications: ProductSpecification
-    shipping: ShippingInfo
+    shipping: ProductShippingDims
     inventory: InventoryInfo
     seo: SEOInfo
     
@@ -207,7 +211,7 @@ class ProductUpdate(BaseModel):
     whats_included: Optional[List[str]] = None
     status: Optional[ProductStatus] = None
     inventory: Optional[InventoryInfo] = None
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=utc_now)
 
 
 class ProductListResponse(BaseModel):
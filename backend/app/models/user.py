@@ -6,46 +6,35 @@ Complete user authentication and profile system
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
-from enum import Enum
+from enum import StrEnum
+from ..core.passwords import hash_password, verify_password, password_needs_rehash
+from .common import Address, Email, utc_now
 from .product import PyObjectId
-import bcrypt
+from bisect import bisect_right
+import random
 import secrets
+import string
 
-class UserRole(str, Enum):
+_REFERRAL_ALPHABET = string.ascii_uppercase + string.digits
+
+class UserRole(StrEnum):
     CUSTOMER = "customer"
     ADMIN = "admin"
     STAFF = "staff"
     GUEST = "guest"
 
-class UserStatus(str, Enum):
+class UserStatus(StrEnum):
     ACTIVE = "active"
     INACTIVE = "inactive"
     SUSPENDED = "suspended"
     PENDING_VERIFICATION = "pending_verification"
 
-class AuthProvider(str, Enum):
+class AuthProvider(StrEnum):
     LOCAL = "local"
     GOOGLE = "google"
     FACEBOOK = "facebook"
     APPLE = "apple"
 
-class Address(BaseModel):
-    """User address information"""
-    label: str = "default"  # home, work, etc
-    first_name: str
-    last_name: str
-    company: Optional[str] = None
-    street_line1: str
-    street_line2: Optional[str] = None
-    city: str
-    state_province: str
-    postal_code: str
-    country: str = "US"
-    phone: str
-    is_default: bool = False
-    is_billing: bool = False
-    is_shipping: bool = False
-
 class PaymentMethod(BaseModel):
     """Saved payment method"""
     id: str = Field(default_factory=lambda: secrets.token_urlsafe(16))
@@ -56,7 +45,7 @@ class PaymentMethod(BaseModel):
     exp_month: Optional[int] = None
     exp_year: Optional[int] = None
     is_default: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
 class NotificationPreferences(BaseModel):
     """User notification settings"""
@@ -87,12 +76,31 @@ class UserProfile(BaseModel):
     preferred_tee_time: Optional[str] = None  # morning, afternoon, evening, night
     skill_level: Optional[str] = None  # beginner, intermediate, advanced, pro
 
+# Permissions granted to each role; "all" grants everything
+_ROLE_PERMISSIONS: Dict[UserRole, frozenset] = {
+    UserRole.ADMIN: frozenset({"all"}),
+    UserRole.STAFF: frozenset({"manage_orders", "manage_products", "view_analytics"}),
+    UserRole.CUSTOMER: frozenset({"place_orders", "view_own_orders"}),
+    UserRole.GUEST: frozenset({"view_products"})
+}
+_NO_PERMISSIONS: frozenset = frozenset()
+
+# VIP tiers by minimum loyalty points, and the discount each tier earns
+_TIER_POINTS = (500, 2000, 5000, 10000)
+_TIERS = (None, "bronze", "silver", "gold", "platinum")
+_TIER_DISCOUNTS = {
+    "bronze": 0.05,    # 5%
+    "silver": 0.10,    # 10%
+    "gold": 0.15,      # 15%
+    "platinum": 0.20   # 20%
+}
+
 class User(BaseModel):
     """Complete user model for NitePutter Pro"""
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     
     # Authentication
-    email: EmailStr = Field(..., description="User email (unique)")
+    email: Email = Field(..., description="User email (unique)")
     username: Optional[str] = Field(None, description="Optional username")
     password_hash: Optional[str] = Field(None, description="Hashed password for local auth")
     
@@ -151,13 +159,15 @@ class User(BaseModel):
     notes: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     deleted_at: Optional[datetime] = None
     
+    # Core schema is built on first validation instead of at import
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
+        defer_build=True,
         json_encoders={
             str: str,  # PyObjectId handled by annotation
             datetime: lambda v: v.isoformat()
@@ -176,43 +186,46 @@ class User(BaseModel):
     def generate_referral_code(cls, v, info):
         if not v and info.data.get('first_name'):
             # Generate unique referral code
-            import random
-            import string
             base = info.data['first_name'][:3].upper()
-            suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+            suffix = ''.join(random.choices(_REFERRAL_ALPHABET, k=5))
             return f"{base}{suffix}"
         return v
     
     def set_password(self, password: str):
         """Hash and set user password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        self.password_hash = hash_password(password)
     
     def verify_password(self, password: str) -> bool:
         """Verify password against hash"""
         if not self.password_hash:
             return False
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return verify_password(password, self.password_hash)
+    
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash is legacy bcrypt or uses outdated argon2 parameters"""
+        if not self.password_hash:
+            return False
+        return password_needs_rehash(self.password_hash)
     
     def generate_verification_token(self) -> str:
         """Generate email verification token"""
         token = secrets.token_urlsafe(32)
         self.email_verification_token = token
-        self.email_verification_expires = datetime.utcnow() + timedelta(hours=24)
+        self.email_verification_expires = utc_now() + timedelta(hours=24)
         return token
     
     def generate_reset_token(self) -> str:
         """Generate password reset token"""
         token = secrets.token_urlsafe(32)
         self.password_reset_token = token
-        self.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
+        self.password_reset_expires = utc_now() + timedelta(hours=1)
         return token
     
     def verify_email(self, token: str) -> bool:
         """Verify email with token"""
         if not self.email_verification_token or self.email_verification_token != token:
             return False
-        if self.email_verification_expires and self.email_verification_expires < datetime.utcnow():
+        if self.email_verification_expires and self.email_verification_expires < utc_now():
             return False
         
         self.is_verified = True
@@ -225,7 +238,7 @@ class User(BaseModel):
         """Check if password can be reset with token"""
         if not self.password_reset_token or self.password_reset_token != token:
             return False
-        if self.password_reset_expires and self.password_reset_expires < datetime.utcnow():
+        if self.password_reset_expires and self.password_reset_expires < utc_now():
             return False
         return True
     
@@ -243,8 +256,8 @@ class User(BaseModel):
     
     def record_login(self):
         """Record successful login"""
-        self.last_login = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
+        self.last_login = utc_now()
+        self.last_activity = utc_now()
         self.login_count += 1
         self.failed_login_attempts = 0
         self.locked_until = None
@@ -254,49 +267,31 @@ class User(BaseModel):
         self.failed_login_attempts += 1
         if self.failed_login_attempts >= 5:
             # Lock account for 30 minutes after 5 failed attempts
-            self.locked_until = datetime.utcnow() + timedelta(minutes=30)
+            self.locked_until = utc_now() + timedelta(minutes=30)
     
     def is_locked(self) -> bool:
         """Check if account is locked"""
-        if self.locked_until and self.locked_until > datetime.utcnow():
+        if self.locked_until and self.locked_until > utc_now():
             return True
         return False
     
     def has_permission(self, permission: str) -> bool:
         """Check if user has specific permission"""
-        permissions = {
-            UserRole.ADMIN: ["all"],
-            UserRole.STAFF: ["manage_orders", "manage_products", "view_analytics"],
-            UserRole.CUSTOMER: ["place_orders", "view_own_orders"],
-            UserRole.GUEST: ["view_products"]
-        }
-        
-        role_permissions = permissions.get(self.role, [])
+        role_permissions = _ROLE_PERMISSIONS.get(self.role, _NO_PERMISSIONS)
         return permission in role_permissions or "all" in role_permissions
     
     def add_loyalty_points(self, points: int):
         """Add loyalty points and update VIP tier"""
         self.loyalty_points += points
         
-        # Update VIP tier based on points
-        if self.loyalty_points >= 10000:
-            self.vip_tier = "platinum"
-        elif self.loyalty_points >= 5000:
-            self.vip_tier = "gold"
-        elif self.loyalty_points >= 2000:
-            self.vip_tier = "silver"
-        elif self.loyalty_points >= 500:
-            self.vip_tier = "bronze"
+        # Update VIP tier based on points; below the first tier it is left as is
+        tier = _TIERS[bisect_right(_TIER_POINTS, self.loyalty_points)]
+        if tier:
+            self.vip_tier = tier
     
     def get_discount_percentage(self) -> float:
         """Get discount percentage based on VIP tier"""
-        discounts = {
-            "bronze": 0.05,    # 5%
-            "silver": 0.10,    # 10%
-            "gold": 0.15,      # 15%
-            "platinum": 0.20   # 20%
-        }
-        return discounts.get(self.vip_tier, 0.0)
+        return _TIER_DISCOUNTS.get(self.vip_tier, 0.0)
 
 
 class UserCreate(BaseModel):
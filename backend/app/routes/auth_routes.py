@@ -7,13 +7,14 @@ from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, EmailStr, Field, validator
+import asyncio
 import logging
 from datetime import datetime, UTC
 
-from ..core.security import security, get_current_user, get_current_user_optional
+from ..core.security import security, security_scheme, get_current_user, get_current_user_optional
 from ..services.auth_service import auth_service
 from ..models.user import UserCreate, UserLogin, PasswordReset, PasswordChange
-from ..config import settings
+from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -141,7 +142,7 @@ async def register(
             message="Registration successful. Please check your email to verify your account.",
             access_token=access_token,
             refresh_token=refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            expires_in=settings.access_token_expire_minutes * 60,
             user={
                 "id": str(user.id),
                 "email": user.email,
@@ -186,7 +187,7 @@ async def login(request: LoginRequest) -> AuthResponse:
         user, access_token, refresh_token = await auth_service.login(login_data)
         
         # Extend token expiry if remember_me
-        expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        expires_in = settings.access_token_expire_minutes * 60
         if request.remember_me:
             expires_in *= 7  # Extend to 7 times longer
         
@@ -234,7 +235,7 @@ async def refresh_token(request: RefreshTokenRequest) -> AuthResponse:
             message="Token refreshed successfully",
             access_token=new_access_token,
             refresh_token=new_refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=settings.access_token_expire_minutes * 60
         )
         
     except HTTPException:
@@ -249,13 +250,17 @@ async def refresh_token(request: RefreshTokenRequest) -> AuthResponse:
 
 @router.post("/logout")
 async def logout(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme)
 ) -> Dict[str, Any]:
     """
     Logout current user
     
     Requires authentication
     """
+    # Stop serving this access token from the decode cache
+    security.forget_token(credentials.credentials)
+    
     try:
         # Get user
         from ..database import get_database
@@ -366,7 +371,8 @@ async def reset_password(request: ResetPasswordRequest) -> Dict[str, Any]:
 @router.post("/change-password")
 async def change_password(
     request: ChangePasswordRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme)
 ) -> Dict[str, Any]:
     """
     Change password for authenticated user
@@ -400,21 +406,23 @@ async def change_password(
         from ..models.user import User
         user = User(**user_doc)
         
-        # Verify current password
-        if not user.verify_password(request.current_password):
+        # Verify current password off the event loop
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, user.verify_password, request.current_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Current password is incorrect"
             )
         
         # Set new password
-        user.set_password(request.new_password)
+        await loop.run_in_executor(None, user.set_password, request.new_password)
         
         # Update in database
         await db.users.update_one(
             {"_id": user_doc["_id"]},
             {"$set": {"password_hash": user.password_hash}}
         )
+        security.forget_token(credentials.credentials)
         
         logger.info(f"Password changed for: {user.email}")
         
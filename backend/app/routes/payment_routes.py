@@ -13,7 +13,8 @@ from decimal import Decimal
 from ..services.payment_service import payment_service
 from ..services.cart_service import cart_service
 from ..services.auth_service import auth_service, security
-from ..config import settings
+from ..core.config import settings
+from ..models.common import to_cents
 
 logger = logging.getLogger(__name__)
 
@@ -129,7 +130,7 @@ async def create_payment_intent_from_cart(
             }
         
         # Calculate total amount in cents
-        amount_cents = int(cart.totals.total * 100)
+        amount_cents = to_cents(cart.totals.total)
         
         # Create metadata
         metadata = {
@@ -153,7 +154,7 @@ async def create_payment_intent_from_cart(
             raise HTTPException(status_code=400, detail=result.get("error", "Payment intent creation failed"))
         
         # Reserve stock for checkout
-        await cart_service.reserve_cart_stock(session_id, settings.RESERVE_STOCK_MINUTES)
+        await cart_service.reserve_cart_stock(session_id, settings.reserve_stock_minutes)
         
         return {
             "success": True,
@@ -342,7 +343,7 @@ async def create_setup_intent(
             "success": True,
             "client_secret": result["client_secret"],
             "setup_intent_id": result["setup_intent_id"],
-            "publishable_key": settings.STRIPE_PUBLISHABLE_KEY
+            "publishable_key": settings.stripe_publishable_key
         }
         
     except Exception as e:
@@ -393,14 +394,14 @@ async def get_stripe_config() -> Dict[str, Any]:
     Get Stripe configuration for frontend
     """
     return {
-        "publishable_key": settings.STRIPE_PUBLISHABLE_KEY,
+        "publishable_key": settings.stripe_publishable_key,
         "supported_countries": ["US", "CA"],
         "supported_payment_methods": ["card"],
         "features": {
             "apple_pay": True,
             "google_pay": True,
             "save_payment_method": True,
-            "tax_calculation": settings.ENABLE_TAX_CALCULATION
+            "tax_calculation": settings.enable_tax_calculation
         }
     }
 
@@ -11,7 +11,7 @@ import logging
 from database import connect_to_mongodb, get_database
 from models.product import (
     Product, ProductCategory, ProductStatus, 
-    ProductImage, ProductSpecification, ShippingInfo, 
+    ProductImage, ProductSpecification, ProductShippingDims, 
     InventoryInfo, SEOInfo
 )
 
@@ -610,7 +610,7 @@ async def seed_products():
             # Convert dictionaries to proper model instances
             product_data["images"] = [ProductImage(**img) for img in product_data_orig["images"]]
             product_data["specifications"] = ProductSpecification(**product_data_orig["specifications"])
-            product_data["shipping"] = ShippingInfo(**product_data_orig["shipping"])
+            product_data["shipping"] = ProductShippingDims(**product_data_orig["shipping"])
             product_data["inventory"] = InventoryInfo(**product_data_orig["inventory"])
             product_data["seo"] = SEOInfo(**product_data_orig["seo"])
             
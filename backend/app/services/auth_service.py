@@ -3,31 +3,28 @@ Authentication Service for NitePutter Pro
 JWT-based authentication with refresh tokens
 """
 
-import os
+import asyncio
 import jwt
 import secrets
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, UTC
 from fastapi import HTTPException, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
 import logging
 
+from ..core.config import settings
 from ..database import get_database
 from ..models.user import User, UserCreate, UserLogin
 
 logger = logging.getLogger(__name__)
 
 # Security configuration
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
-REFRESH_SECRET_KEY = os.getenv("JWT_REFRESH_SECRET_KEY", secrets.token_urlsafe(32))
+SECRET_KEY = settings.jwt_config.secret_key
+REFRESH_SECRET_KEY = settings.jwt_config.refresh_secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # HTTP Bearer for JWT
 security = HTTPBearer()
 
@@ -63,8 +60,9 @@ class AuthService:
             preferences={"newsletter_subscribed": user_data.newsletter_subscribed}
         )
         
-        # Hash password
-        user.set_password(user_data.password)
+        # Hash password off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, user.set_password, user_data.password)
         
         # Generate verification token
         user.generate_verification_token()
@@ -108,8 +106,9 @@ class AuthService:
                 detail="Account is temporarily locked due to multiple failed login attempts"
             )
         
-        # Verify password
-        if not user.verify_password(credentials.password):
+        # Verify password off the event loop
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, user.verify_password, credentials.password):
             user.record_failed_login()
             await db.users.update_one(
                 {"_id": user_doc["_id"]},
@@ -125,15 +124,22 @@ class AuthService:
         
         # Record successful login
         user.record_login()
+        login_fields = {
+            "last_login": user.last_login,
+            "last_activity": user.last_activity,
+            "login_count": user.login_count,
+            "failed_login_attempts": 0,
+            "locked_until": None
+        }
+        
+        # Upgrade legacy bcrypt hashes to argon2id while the password is at hand
+        if user.password_needs_rehash():
+            await loop.run_in_executor(None, user.set_password, credentials.password)
+            login_fields["password_hash"] = user.password_hash
+        
         await db.users.update_one(
             {"_id": user_doc["_id"]},
-            {"$set": {
-                "last_login": user.last_login,
-                "last_activity": user.last_activity,
-                "login_count": user.login_count,
-                "failed_login_attempts": 0,
-                "locked_until": None
-            }}
+            {"$set": login_fields}
         )
         
         # Generate tokens
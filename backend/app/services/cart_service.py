@@ -6,11 +6,11 @@ Persistent cart management with MongoDB
 import secrets
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, UTC
-from decimal import Decimal
 from bson import ObjectId
+from pymongo import UpdateOne, DESCENDING
 import logging
 
-from ..database import get_database
+from ..database import get_database, cart_repository
 from ..models.cart import (
     ShoppingCart, CartStatus, CartItem, CartItemStatus,
     CartItemAdd, CartItemUpdate, CartCouponApply,
@@ -80,17 +80,17 @@ class CartService:
                 
                 session_cart_obj.merge_with(user_cart_obj)
                 
-                # Update session cart
-                await db.carts.update_one(
-                    {"_id": session_cart["_id"]},
-                    {"$set": self._cart_to_dict(session_cart_obj)}
-                )
-                
-                # Mark user cart as merged
-                await db.carts.update_one(
-                    {"_id": user_cart["_id"]},
-                    {"$set": {"status": CartStatus.MERGED.value}}
-                )
+                # Update session cart and mark user cart as merged in one round-trip
+                await cart_repository.flush([
+                    UpdateOne(
+                        {"_id": session_cart["_id"]},
+                        {"$set": self._cart_to_dict(session_cart_obj)}
+                    ),
+                    UpdateOne(
+                        {"_id": user_cart["_id"]},
+                        {"$set": {"status": CartStatus.MERGED.value}}
+                    )
+                ])
                 
                 logger.info(f"Merged carts for user: {user_id}")
     
@@ -122,14 +122,30 @@ class CartService:
             "compare_at_price": str(product.compare_at_price) if product.compare_at_price else str(product.price)
         }
         
-        cart.add_item(product_data, item_data.quantity)
-        
-        # Update cart in database
-        cart_dict = self._cart_to_dict(cart)
-        await db.carts.update_one(
-            {"_id": ObjectId(cart.id)},
-            {"$set": cart_dict}
-        )
+        item_count = len(cart.items)
+        item = cart.add_item(product_data, item_data.quantity)
+        
+        # Update cart in database, sending only the changed item
+        pushed = False
+        if len(cart.items) > item_count:
+            # Guarded so a concurrent add of the same product can't create a
+            # second line item; if it got there first, increment it instead
+            result = await db.carts.update_one(
+                {"_id": ObjectId(cart.id), "items.product_id": {"$ne": item.product_id}},
+                {
+                    "$push": {"items": item.model_dump(exclude_none=True)},
+                    "$set": self._totals_fields(cart)
+                }
+            )
+            pushed = result.matched_count > 0
+        if not pushed:
+            await db.carts.update_one(
+                {"_id": ObjectId(cart.id), "items.product_id": item.product_id},
+                {
+                    "$inc": self._item_increments(item, item_data.quantity),
+                    "$set": {"items.$.updated_at": item.updated_at, **self._totals_fields(cart)}
+                }
+            )
         
         logger.info(f"Added {item_data.quantity}x {product.name} to cart {cart.id}")
         return cart
@@ -143,12 +159,21 @@ class CartService:
         if not cart.update_item_quantity(product_id, update_data.quantity):
             raise ValueError(f"Product not found in cart: {product_id}")
         
-        # Update cart in database
-        cart_dict = self._cart_to_dict(cart)
-        await db.carts.update_one(
-            {"_id": ObjectId(cart.id)},
-            {"$set": cart_dict}
-        )
+        # Update cart in database, sending only the changed item
+        if update_data.quantity <= 0:
+            await db.carts.update_one(
+                {"_id": ObjectId(cart.id)},
+                {
+                    "$pull": {"items": {"product_id": product_id}},
+                    "$set": self._totals_fields(cart)
+                }
+            )
+        else:
+            item = next(item for item in cart.items if item.product_id == product_id)
+            await db.carts.update_one(
+                {"_id": ObjectId(cart.id), "items.product_id": product_id},
+                {"$set": {**self._item_fields(item), **self._totals_fields(cart)}}
+            )
         
         logger.info(f"Updated quantity for product {product_id} in cart {cart.id}")
         return cart
@@ -162,11 +187,13 @@ class CartService:
         if not cart.remove_item(product_id):
             raise ValueError(f"Product not found in cart: {product_id}")
         
-        # Update cart in database
-        cart_dict = self._cart_to_dict(cart)
+        # Update cart in database, pulling just the removed item
         await db.carts.update_one(
             {"_id": ObjectId(cart.id)},
-            {"$set": cart_dict}
+            {
+                "$pull": {"items": {"product_id": product_id}},
+                "$set": self._totals_fields(cart)
+            }
         )
         
         logger.info(f"Removed product {product_id} from cart {cart.id}")
@@ -364,10 +391,16 @@ class CartService:
         
         # Find abandoned carts
         cutoff_time = datetime.now(UTC) - timedelta(hours=1)
-        abandoned_carts = await db.carts.find({
+        abandoned_query = {
             "status": CartStatus.ACTIVE.value,
             "updated_at": {"$lt": cutoff_time}
-        }).to_list(None)
+        }
+        # Most recently abandoned first, served by cart_status_updated_compound
+        abandoned_carts = await (
+            db.carts.find(abandoned_query)
+            .sort("updated_at", DESCENDING)
+            .to_list(None)
+        )
         
         for cart_doc in abandoned_carts:
             cart = ShoppingCart(**cart_doc)
@@ -400,21 +433,35 @@ class CartService:
         
         logger.info(f"Cleaned up {len(abandoned_carts)} abandoned carts")
     
+    def _item_fields(self, item: CartItem) -> Dict[str, Any]:
+        """Positional $set fields for an item matched by items.product_id"""
+        return {
+            "items.$.quantity": item.quantity,
+            "items.$.subtotal": item.subtotal,
+            "items.$.updated_at": item.updated_at
+        }
+    
+    def _item_increments(self, item: CartItem, quantity: int) -> Dict[str, Any]:
+        """Positional $inc fields for adding quantity to an item matched by items.product_id"""
+        return {
+            "items.$.quantity": quantity,
+            "items.$.subtotal": item.unit_price * quantity
+        }
+    
+    def _totals_fields(self, cart: ShoppingCart) -> Dict[str, Any]:
+        """$set fields for the recalculated totals"""
+        return {
+            "totals": cart.totals.model_dump(exclude_none=True),
+            "updated_at": cart.updated_at
+        }
+    
     def _cart_to_dict(self, cart: ShoppingCart) -> Dict[str, Any]:
-        """Convert cart to dictionary for MongoDB"""
-        cart_dict = cart.model_dump(by_alias=True, exclude_none=True)
-        
-        # Convert Decimal to float
-        def convert_decimals(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, dict):
-                return {k: convert_decimals(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_decimals(item) for item in obj]
-            return obj
-        
-        return convert_decimals(cart_dict)
+        """Convert cart to dictionary for MongoDB
+        
+        Decimal values are left as-is; the client's DecimalCodec stores
+        them as Decimal128.
+        """
+        return cart.model_dump(by_alias=True, exclude_none=True)
 
 
 # Create singleton instance
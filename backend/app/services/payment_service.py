@@ -4,17 +4,17 @@ Complete payment processing with Stripe API
 """
 
 import stripe
-import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime, UTC
 from decimal import Decimal
 import logging
 import json
 
-# Import settings
-STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
-STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
-STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY", "")
+from ..core.config import settings
+
+STRIPE_SECRET_KEY = settings.get_stripe_key()
+STRIPE_WEBHOOK_SECRET = settings.get_stripe_webhook_secret() or ""
+STRIPE_PUBLISHABLE_KEY = settings.stripe_publishable_key
 
 # Initialize Stripe
 stripe.api_key = STRIPE_SECRET_KEY
@@ -3,7 +3,6 @@ Stripe Payment Service for NitePutter Pro
 Real Stripe integration for production checkout
 """
 
-import os
 import stripe
 from typing import Optional, Dict, Any, List
 from datetime import datetime, UTC
@@ -11,21 +10,23 @@ from decimal import Decimal
 from bson import ObjectId
 import logging
 
+from ..core.config import settings
 from ..database import get_database
 from ..models.order import (
     Order, OrderStatus, PaymentStatus, PaymentMethod,
-    OrderItem, ShippingInfo, PaymentInfo, Address
+    OrderItem, OrderShippingInfo, PaymentInfo, Address
 )
 from ..models.cart import ShoppingCart
+from ..models.common import to_cents, from_cents
 from ..services.cart_service import cart_service
 
 logger = logging.getLogger(__name__)
 
 # Initialize Stripe with the API key
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+stripe.api_key = settings.get_stripe_key()
 
 # Webhook endpoint secret for verifying webhooks
-WEBHOOK_ENDPOINT_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+WEBHOOK_ENDPOINT_SECRET = settings.get_stripe_webhook_secret() or ""
 
 class StripeService:
     """Service for handling Stripe payments"""
@@ -68,7 +69,7 @@ class StripeService:
                             "sku": item.product_sku
                         }
                     },
-                    "unit_amount": int(item.unit_price * 100),  # Convert to cents
+                    "unit_amount": to_cents(item.unit_price),
                 },
                 "quantity": item.quantity
             })
@@ -331,14 +332,14 @@ class StripeService:
             method=PaymentMethod.STRIPE,
             status=PaymentStatus.COMPLETED,
             stripe_payment_intent_id=full_session.payment_intent.id if full_session.payment_intent else None,
-            amount=Decimal(str(full_session.amount_total / 100)),
+            amount=from_cents(full_session.amount_total),
             currency=full_session.currency.upper()
         )
         
         # Build shipping info
-        shipping_info = ShippingInfo(
+        shipping_info = OrderShippingInfo(
             method="standard",  # Based on selected shipping option
-            cost=Decimal(str(full_session.total_details.amount_shipping / 100))
+            cost=from_cents(full_session.total_details.amount_shipping)
         )
         
         # Create order
@@ -348,11 +349,11 @@ class StripeService:
             billing_address=billing_address,
             shipping_address=shipping_address,
             items=order_items,
-            subtotal=Decimal(str(full_session.amount_subtotal / 100)),
-            shipping_total=Decimal(str(full_session.total_details.amount_shipping / 100)),
-            tax_total=Decimal(str(full_session.total_details.amount_tax / 100)),
-            discount_total=Decimal(str(full_session.total_details.amount_discount / 100)),
-            total=Decimal(str(full_session.amount_total / 100)),
+            subtotal=from_cents(full_session.amount_subtotal),
+            shipping_total=from_cents(full_session.total_details.amount_shipping),
+            tax_total=from_cents(full_session.total_details.amount_tax),
+            discount_total=from_cents(full_session.total_details.amount_discount),
+            total=from_cents(full_session.amount_total),
             payment=payment_info,
             shipping=shipping_info,
             status=OrderStatus.PROCESSING,
@@ -435,7 +436,7 @@ class StripeService:
         
         # Determine refund amount
         refund_amount = amount or order.total
-        refund_amount_cents = int(refund_amount * 100)
+        refund_amount_cents = to_cents(refund_amount)
         
         # Create Stripe refund
         try:
@@ -0,0 +1,11 @@
+"""
+Shared test setup for NitePutter Pro
+Provides the required settings so app modules import without a .env file
+"""
+
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017/niteputter_test")
+os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test_unit")
+os.environ.setdefault("STRIPE_PUBLISHABLE_KEY", "pk_test_unit")
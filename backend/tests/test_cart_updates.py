@@ -0,0 +1,148 @@
+"""
+Cart Persistence Tests for NitePutter Pro
+Checks the partial update documents CartService writes for item changes
+"""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+
+from app.models.cart import ShoppingCart, CartItemAdd, CartItemUpdate
+from app.services import cart_service as cart_service_module
+from app.services.cart_service import CartService
+
+PRODUCT_ID = str(ObjectId())
+
+
+def product_data(product_id: str = PRODUCT_ID, price: str = "149.99") -> dict:
+    return {"id": product_id, "sku": "TEST-001", "name": "Test Putter Light", "price": price}
+
+
+def stub_product(monkeypatch, product_id: str, sku: str, name: str, price: str):
+    """Make CartService load a fixed in-stock product"""
+    product = MagicMock(id=product_id, sku=sku, images=[], price=Decimal(price), compare_at_price=None)
+    product.name = name
+    product.is_in_stock.return_value = True
+    monkeypatch.setattr(cart_service_module, "Product", MagicMock(return_value=product))
+
+
+@pytest.fixture
+def cart():
+    cart = ShoppingCart(id=str(ObjectId()), session_id="test_session")
+    cart.add_item(product_data(), 2)
+    return cart
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Fake database recording cart writes"""
+    db = MagicMock()
+    db.carts.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+    db.products.find_one = AsyncMock(return_value={"_id": ObjectId()})
+    monkeypatch.setattr(cart_service_module, "get_database", AsyncMock(return_value=db))
+    return db
+
+
+@pytest.fixture
+def service(cart, monkeypatch):
+    service = CartService()
+    monkeypatch.setattr(service, "get_or_create_cart", AsyncMock(return_value=cart))
+    return service
+
+
+def sent_update(db):
+    """Filter and update document of the single update_one call"""
+    db.carts.update_one.assert_awaited_once()
+    return db.carts.update_one.await_args.args
+
+
+class TestPartialCartUpdates:
+    """Item changes write only the changed item plus totals"""
+
+    @pytest.mark.asyncio
+    async def test_update_quantity_sets_positional_item(self, service, cart, db):
+        """A quantity change is a positional $set matched by product_id"""
+        await service.update_cart_item("test_session", PRODUCT_ID, CartItemUpdate(quantity=3))
+
+        query, update = sent_update(db)
+        assert query == {"_id": ObjectId(cart.id), "items.product_id": PRODUCT_ID}
+        assert set(update) == {"$set"}
+        assert update["$set"]["items.$.quantity"] == 3
+        assert update["$set"]["items.$.subtotal"] == Decimal("449.97")
+        assert update["$set"]["totals"]["subtotal"] == Decimal("449.97")
+        assert "items" not in update["$set"]
+
+    @pytest.mark.asyncio
+    async def test_update_quantity_zero_pulls_item(self, service, cart, db):
+        """Setting the quantity to zero removes the item with $pull"""
+        await service.update_cart_item("test_session", PRODUCT_ID, CartItemUpdate(quantity=0))
+
+        query, update = sent_update(db)
+        assert query == {"_id": ObjectId(cart.id)}
+        assert update["$pull"] == {"items": {"product_id": PRODUCT_ID}}
+        assert update["$set"]["totals"]["subtotal"] == Decimal("0")
+
+    @pytest.mark.asyncio
+    async def test_update_missing_item(self, service, db):
+        """Unknown products raise without writing"""
+        with pytest.raises(ValueError):
+            await service.update_cart_item("test_session", str(ObjectId()), CartItemUpdate(quantity=1))
+
+        db.carts.update_one.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_remove_pulls_item(self, service, cart, db):
+        """Removal pulls just the item and refreshes totals"""
+        await service.remove_from_cart("test_session", PRODUCT_ID)
+
+        query, update = sent_update(db)
+        assert query == {"_id": ObjectId(cart.id)}
+        assert update["$pull"] == {"items": {"product_id": PRODUCT_ID}}
+        assert update["$set"]["totals"]["item_count"] == 0
+        assert update["$set"]["updated_at"] == cart.updated_at
+
+    @pytest.mark.asyncio
+    async def test_add_new_item_pushes(self, service, cart, db, monkeypatch):
+        """A new product is appended with $push"""
+        other_id = str(ObjectId())
+        stub_product(monkeypatch, other_id, "TEST-002", "Test Putter Basic", "99.99")
+
+        await service.add_to_cart("test_session", CartItemAdd(product_id=other_id, quantity=1))
+
+        query, update = sent_update(db)
+        assert query == {"_id": ObjectId(cart.id), "items.product_id": {"$ne": other_id}}
+        assert update["$push"]["items"]["product_id"] == other_id
+        assert update["$push"]["items"]["quantity"] == 1
+        assert update["$set"]["totals"]["item_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_add_existing_item_increments(self, service, cart, db, monkeypatch):
+        """Adding a product already in the cart increments its quantity in place"""
+        stub_product(monkeypatch, PRODUCT_ID, "TEST-001", "Test Putter Light", "149.99")
+
+        await service.add_to_cart("test_session", CartItemAdd(product_id=PRODUCT_ID, quantity=1))
+
+        query, update = sent_update(db)
+        assert query == {"_id": ObjectId(cart.id), "items.product_id": PRODUCT_ID}
+        assert "$push" not in update
+        assert update["$inc"] == {"items.$.quantity": 1, "items.$.subtotal": Decimal("149.99")}
+        assert "items.$.quantity" not in update["$set"]
+        assert update["$set"]["totals"]["total_quantity"] == 3
+
+    @pytest.mark.asyncio
+    async def test_add_new_item_raced_falls_back_to_increment(self, service, cart, db, monkeypatch):
+        """If a concurrent request already pushed the product, increment it instead"""
+        other_id = str(ObjectId())
+        stub_product(monkeypatch, other_id, "TEST-002", "Test Putter Basic", "99.99")
+        db.carts.update_one.return_value = MagicMock(matched_count=0)
+
+        await service.add_to_cart("test_session", CartItemAdd(product_id=other_id, quantity=2))
+
+        assert db.carts.update_one.await_count == 2
+        push_query, push_update = db.carts.update_one.await_args_list[0].args
+        query, update = db.carts.update_one.await_args_list[1].args
+        assert push_query["items.product_id"] == {"$ne": other_id}
+        assert "$push" in push_update
+        assert query == {"_id": ObjectId(cart.id), "items.product_id": other_id}
+        assert update["$inc"] == {"items.$.quantity": 2, "items.$.subtotal": Decimal("199.98")}
@@ -0,0 +1,114 @@
+"""
+Configuration Tests for NitePutter Pro
+Tests how list and legacy settings are read from the environment
+"""
+
+import os
+
+from app.core.config import Settings
+
+
+def load_settings(**kwargs) -> Settings:
+    """Settings from the process environment only, ignoring any local .env"""
+    return Settings(_env_file=kwargs.pop("_env_file", None), **kwargs)
+
+
+class TestListSettings:
+    """CommaSeparatedList env decoding"""
+
+    def test_comma_separated(self, monkeypatch):
+        """Plain comma-separated values are split and stripped"""
+        monkeypatch.setenv("ALLOWED_ORIGINS", "https://a.com, https://b.com")
+
+        assert load_settings().allowed_origins == ["https://a.com", "https://b.com"]
+
+    def test_json_array(self, monkeypatch):
+        """JSON arrays are decoded as-is"""
+        monkeypatch.setenv("ALLOWED_ORIGINS", '["https://a.com", "https://b.com"]')
+
+        assert load_settings().allowed_origins == ["https://a.com", "https://b.com"]
+
+    def test_json_array_keeps_commas(self, monkeypatch):
+        """Items of a JSON array are not split on commas"""
+        monkeypatch.setenv("CORS_ALLOW_HEADERS", '["Content-Type", "X-List,With-Comma"]')
+
+        assert load_settings().cors_allow_headers == ["Content-Type", "X-List,With-Comma"]
+
+    def test_single_value(self, monkeypatch):
+        """A single value becomes a one-item list"""
+        monkeypatch.setenv("CORS_ALLOW_METHODS", "GET")
+
+        assert load_settings().cors_allow_methods == ["GET"]
+
+    def test_default(self, monkeypatch):
+        """Unset lists keep their defaults"""
+        monkeypatch.delenv("CORS_ALLOW_METHODS", raising=False)
+
+        assert load_settings().cors_allow_methods == ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+
+    def test_env_file(self, tmp_path, monkeypatch):
+        """The same decoding applies to values read from a .env file"""
+        monkeypatch.delenv("ALLOWED_ORIGINS", raising=False)
+        monkeypatch.delenv("CORS_ALLOW_METHODS", raising=False)
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            'ALLOWED_ORIGINS=["https://a.com","https://b.com"]\n'
+            "CORS_ALLOW_METHODS=GET,POST\n"
+        )
+
+        settings = load_settings(_env_file=env_file)
+
+        assert settings.allowed_origins == ["https://a.com", "https://b.com"]
+        assert settings.cors_allow_methods == ["GET", "POST"]
+
+
+class TestEnvSources:
+    """Legacy names and process environment handling"""
+
+    def test_legacy_database_name(self, monkeypatch):
+        """DATABASE_NAME still maps to mongodb_db_name"""
+        monkeypatch.delenv("MONGODB_DB_NAME", raising=False)
+        monkeypatch.setenv("DATABASE_NAME", "legacy_db")
+
+        assert load_settings().mongodb_db_name == "legacy_db"
+
+    def test_null_clears_optional(self, monkeypatch):
+        """The string null clears an optional setting"""
+        monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", "null")
+
+        assert load_settings().stripe_webhook_secret is None
+
+    def test_env_file_not_copied_to_environ(self, tmp_path, monkeypatch):
+        """Values from a .env file stay out of os.environ"""
+        monkeypatch.delenv("DATABASE_NAME", raising=False)
+        env_file = tmp_path / ".env"
+        env_file.write_text("DATABASE_NAME=from_file\n")
+
+        settings = load_settings(_env_file=env_file)
+
+        assert settings.mongodb_db_name == "from_file"
+        assert "DATABASE_NAME" not in os.environ
+
+    def test_jwt_secret_key_wins(self, monkeypatch):
+        """JWT_SECRET_KEY signs tokens even when SECRET_KEY is also set"""
+        monkeypatch.setenv("SECRET_KEY", "app-secret")
+        monkeypatch.setenv("JWT_SECRET_KEY", "jwt-secret")
+        monkeypatch.setenv("REFRESH_SECRET_KEY", "app-refresh")
+        monkeypatch.setenv("JWT_REFRESH_SECRET_KEY", "jwt-refresh")
+
+        jwt_config = load_settings().jwt_config
+
+        assert jwt_config.secret_key == "jwt-secret"
+        assert jwt_config.refresh_secret_key == "jwt-refresh"
+
+    def test_secret_key_alone(self, monkeypatch):
+        """SECRET_KEY is used when no JWT_SECRET_KEY is set"""
+        monkeypatch.setenv("SECRET_KEY", "app-secret")
+        monkeypatch.delenv("JWT_SECRET_KEY", raising=False)
+        monkeypatch.delenv("REFRESH_SECRET_KEY", raising=False)
+        monkeypatch.delenv("JWT_REFRESH_SECRET_KEY", raising=False)
+
+        jwt_config = load_settings().jwt_config
+
+        assert jwt_config.secret_key == "app-secret"
+        assert jwt_config.refresh_secret_key == "app-secret"
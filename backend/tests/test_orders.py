@@ -0,0 +1,53 @@
+"""
+Order Number Tests for NitePutter Pro
+Tests the NPP-YYYYMMDD-XXXX order number format
+"""
+
+import re
+from datetime import datetime, timezone
+
+from app.models import order as order_module
+from app.models.order import generate_order_number
+
+ORDER_NUMBER_RE = re.compile(r"^NPP-(\d{8})-(\d{4})$")
+
+
+class TestOrderNumbers:
+    """generate_order_number"""
+
+    def test_format(self):
+        """NPP-YYYYMMDD-XXXX with a four-digit suffix in 1000-9999"""
+        match = ORDER_NUMBER_RE.match(generate_order_number())
+
+        assert match
+        assert 1000 <= int(match.group(2)) <= 9999
+
+    def test_date_is_utc_today(self):
+        """The date part is the current UTC day"""
+        before = datetime.now(timezone.utc).strftime("%Y%m%d")
+        date_part = ORDER_NUMBER_RE.match(generate_order_number()).group(1)
+        after = datetime.now(timezone.utc).strftime("%Y%m%d")
+
+        assert date_part in (before, after)
+
+    def test_date_for_day_number(self):
+        """UTC day numbers format to the matching calendar date"""
+        assert order_module._order_date(0) == "19700101"
+        assert order_module._order_date(19000) == "20220108"
+
+    def test_date_rolls_over(self, monkeypatch):
+        """The cached date follows the clock across midnight UTC"""
+        day = 20000 * 86400
+        monkeypatch.setattr(order_module.time, "time", lambda: day - 1)
+        first = generate_order_number()
+        monkeypatch.setattr(order_module.time, "time", lambda: day)
+        second = generate_order_number()
+
+        assert first.startswith("NPP-20241003-")
+        assert second.startswith("NPP-20241004-")
+
+    def test_suffixes_vary(self):
+        """Suffixes are random, not a sequence that repeats across workers"""
+        suffixes = {generate_order_number()[-4:] for _ in range(50)}
+
+        assert len(suffixes) > 1
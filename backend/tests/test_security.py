@@ -0,0 +1,108 @@
+"""
+JWT Encoding Tests for NitePutter Pro
+Checks that hand-built HS256 tokens decode with PyJWT
+"""
+
+import pytest
+import jwt
+from datetime import datetime, timedelta, UTC
+
+from app.core.security import Security, _encode_jwt
+
+KEY = "unit-test-signing-key-0123456789abcdef"
+
+
+class TestEncodeJWT:
+    """_encode_jwt against jwt.decode"""
+
+    def test_round_trip_matches_pyjwt(self):
+        """The cached-header token decodes to the same claims PyJWT encodes"""
+        now = datetime.now(UTC).replace(microsecond=0)
+        payload = {
+            "sub": "user-1",
+            "email": "golfer@example.com",
+            "exp": now + timedelta(minutes=5),
+            "iat": now,
+            "jti": "abc123"
+        }
+
+        token = _encode_jwt(payload, KEY, "HS256")
+        decoded = jwt.decode(token, KEY, algorithms=["HS256"])
+
+        assert decoded == jwt.decode(jwt.encode(payload, KEY, algorithm="HS256"), KEY, algorithms=["HS256"])
+        assert decoded["exp"] == int((now + timedelta(minutes=5)).timestamp())
+        assert decoded["iat"] == int(now.timestamp())
+        assert decoded["jti"] == "abc123"
+        assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+    def test_integer_time_claims_pass_through(self):
+        """Integer exp/iat are left as-is"""
+        exp = int((datetime.now(UTC) + timedelta(minutes=5)).timestamp())
+
+        decoded = jwt.decode(_encode_jwt({"sub": "u", "exp": exp}, KEY, "HS256"), KEY, algorithms=["HS256"])
+
+        assert decoded["exp"] == exp
+
+    def test_does_not_mutate_payload(self):
+        """Datetime claims are converted on a copy"""
+        exp = datetime.now(UTC) + timedelta(minutes=5)
+        payload = {"sub": "u", "exp": exp}
+
+        _encode_jwt(payload, KEY, "HS256")
+
+        assert payload["exp"] is exp
+
+    def test_expired_token_rejected(self):
+        """exp in the past is enforced by jwt.decode"""
+        token = _encode_jwt({"sub": "u", "exp": datetime.now(UTC) - timedelta(seconds=5)}, KEY, "HS256")
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            jwt.decode(token, KEY, algorithms=["HS256"])
+
+    def test_wrong_key_rejected(self):
+        """The signature is checked"""
+        token = _encode_jwt({"sub": "u"}, KEY, "HS256")
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            jwt.decode(token, KEY + "x", algorithms=["HS256"])
+
+
+class TestSecurityTokens:
+    """Access and refresh tokens issued by Security"""
+
+    def test_access_token_claims(self):
+        """Access tokens carry integer exp/iat, a jti and the access type"""
+        token = Security.create_access_token({"sub": "user-1", "role": "customer"})
+        decoded = jwt.decode(token, Security.SECRET_KEY, algorithms=[Security.ALGORITHM])
+
+        assert decoded["sub"] == "user-1"
+        assert decoded["type"] == "access"
+        assert isinstance(decoded["exp"], int)
+        assert isinstance(decoded["iat"], int)
+        assert decoded["exp"] > decoded["iat"]
+        assert decoded["jti"]
+
+    def test_refresh_token_claims(self):
+        """Refresh tokens are signed with the refresh key"""
+        token = Security.create_refresh_token({"sub": "user-1"})
+        decoded = jwt.decode(token, Security.REFRESH_SECRET_KEY, algorithms=[Security.ALGORITHM])
+
+        assert decoded["type"] == "refresh"
+        assert decoded["jti"]
+
+    def test_jti_unique(self):
+        """Each token gets its own jti"""
+        first = jwt.decode(Security.create_access_token({"sub": "u"}), Security.SECRET_KEY, algorithms=[Security.ALGORITHM])
+        second = jwt.decode(Security.create_access_token({"sub": "u"}), Security.SECRET_KEY, algorithms=[Security.ALGORITHM])
+
+        assert first["jti"] != second["jti"]
+
+    def test_decode_token_returns_copy(self):
+        """Mutating a decoded payload does not leak into the decode cache"""
+        token = Security.create_access_token({"sub": "user-1"})
+
+        payload = Security.decode_token(token)
+        payload["role"] = "admin"
+
+        assert "role" not in Security.decode_token(token)
+        Security.forget_token(token)